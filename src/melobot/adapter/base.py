@@ -177,7 +177,7 @@ class Adapter(
                 event: Event = await self._event_factory.create(packet)
                 EventOrigin.set_origin(event, EventOrigin(self, src))
                 await self._hook_bus.emit(AdapterLifeSpan.BEFORE_EVENT_HANDLE, True, args=(event,))
-                self.dispatcher.broadcast(event)
+                await self.dispatcher.broadcast(event)
             except Exception:
                 logger.generic_exc(
                     f"适配器 {self} 处理输入源 {src} 时发生异常",
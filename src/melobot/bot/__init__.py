@@ -2,6 +2,7 @@ from typing_extensions import Any
 
 from ..ctx import BotCtx as _BotCtx
 from .base import Bot, BotLifeSpan
+from .dispatch import ChannelLimit, ShedPolicy
 
 
 def get_bot() -> Bot:
@@ -40,7 +40,7 @@ from ..plugin.ipc import AsyncShare, IPCManager, SyncShare
 from ..plugin.load import PluginLoader
 from ..protocols.base import ProtocolStack
 from ..typ.base import AsyncCallable, P, SyncOrAsyncCallable
-from .dispatch import Dispatcher, wait_dispatched
+from .dispatch import ChannelLimit, Dispatcher, wait_dispatched
 
 
 class BotLifeSpan(Enum):
@@ -94,7 +94,15 @@ class Bot(HookMixin[BotLifeSpan]):
         Bot.__instances__[name] = obj
         return obj
 
-    def __init__(self, name: str = "melobot", /, logger: GenericLogger | None = None) -> None:
+    def __init__(
+        self,
+        name: str = "melobot",
+        /,
+        logger: GenericLogger | None = None,
+        batch_dispatch: bool = False,
+        channel_limit: ChannelLimit | None = None,
+        scope_lanes: int | None = None,
+    ) -> None:
         """
         初始化 bot
 
@@ -102,6 +110,16 @@ class Bot(HookMixin[BotLifeSpan]):
         :param logger:
             bot 使用的日志器，符合 :class:`.GenericLogger` 的接口即可。
             可使用 melobot 内置的 :class:`.Logger`，或经过 :func:`.logger_patch` 修补的日志器
+        :param batch_dispatch:
+            是否启用批量分发模式。启用后，每个优先级通道将一次取出的所有事件作为一个调度单元处理，
+            批内所有事件处理完成后再统一向更低优先级传播。适用于突发的大量事件，但单个事件的传播可能被同批事件延迟
+        :param channel_limit:
+            分发通道的容量限制，为空时不限制。
+            过载时按限制中的策略阻塞事件输入或丢弃事件，丢弃计数可通过 :meth:`get_shed_counts` 获取
+        :param scope_lanes:
+            按域分片分发时，同时分发的最大事件数，为空时不启用。
+            启用后，同一域（例如同一个群聊）的事件按到达顺序逐个分发，不同域的事件轮流分发。
+            前一事件分发完成，或处理它的会话挂起后，同一域的下一事件才开始分发
         """
         super().__init__(hook_type=BotLifeSpan, hook_tag=name)
         self.name = name
@@ -116,7 +134,7 @@ class Bot(HookMixin[BotLifeSpan]):
         self._out_srcs: dict[str, set[AbstractOutSource]] = {}
         self._loader = PluginLoader()
         self._plugins: dict[str, Plugin] = {}
-        self._dispatcher = Dispatcher()
+        self._dispatcher = Dispatcher(batch=batch_dispatch, limit=channel_limit, lanes=scope_lanes)
         self._inited = False
         self._running = False
         self._closed = False
@@ -560,6 +578,13 @@ class Bot(HookMixin[BotLifeSpan]):
         """
         self._dispatcher.add(*flows)
 
+    def get_shed_counts(self) -> dict[str, int]:
+        """获取因分发通道过载而被丢弃的事件数量
+
+        :return: 事件类名到丢弃数量的映射
+        """
+        return dict(self._dispatcher.shed_counts)
+
     async def wait_finish(self, event: Event) -> None:
         """等待事件被所有处理流处理完成
 
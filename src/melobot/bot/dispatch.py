@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import asyncio
 import contextvars
-from asyncio import Queue, Task
+from asyncio import Future, Task
 from collections import deque
+from enum import Enum
 
-from typing_extensions import TYPE_CHECKING
+from typing_extensions import TYPE_CHECKING, Callable, Hashable, Sequence, assert_never, cast
 
 from .._run import is_runner_running, register_started_hook
 from ..adapter.base import Event
+from ..adapter.model import TextEvent
 from ..handle.base import Flow
 from ..log.base import LogLevel
 from ..log.reflect import logger
@@ -17,21 +19,109 @@ if TYPE_CHECKING:
     from .base import Bot
 
 
+class ShedPolicy(Enum):
+    """通道过载时的处理策略枚举"""
+
+    #: 阻塞事件的输入，直到通道有空余容量（即背压）
+    BLOCK = "block"
+    #: 丢弃新到达的事件
+    DROP_NEWEST = "drop_newest"
+    #: 丢弃通道中排队最久的事件
+    DROP_OLDEST = "drop_oldest"
+    #: 优先丢弃指定类型的事件（例如心跳事件），没有可丢弃的指定类型事件时，丢弃排队最久的事件
+    DROP_BY_TYPE = "drop_by_type"
+    #: 丢弃重要程度最低的事件，重要程度相同时丢弃排队最久的事件
+    DROP_BY_PRIORITY = "drop_by_priority"
+
+
+class ChannelLimit:
+    """分发通道的容量限制"""
+
+    def __init__(
+        self,
+        capacity: int,
+        policy: ShedPolicy = ShedPolicy.BLOCK,
+        shed_types: Sequence[type[Event]] = (),
+        priority_key: Callable[[Event], int] | None = None,
+    ) -> None:
+        """初始化一个分发通道的容量限制
+
+        :param capacity: 每个优先级通道最多容纳的事件数（排队中与处理中的总和）
+        :param policy: 通道容量已满时的处理策略
+        :param shed_types: 优先丢弃的事件类型，`policy` 为 :obj:`.ShedPolicy.DROP_BY_TYPE` 时必须提供
+        :param priority_key:
+            返回事件重要程度的函数，值越小越先被丢弃，
+            `policy` 为 :obj:`.ShedPolicy.DROP_BY_PRIORITY` 时必须提供
+        """
+        if capacity < 1:
+            raise ValueError(f"通道容量必须为正整数，当前值：{capacity}")
+        if policy is ShedPolicy.DROP_BY_TYPE and not len(shed_types):
+            raise ValueError(f"使用 {policy} 策略时，必须提供优先丢弃的事件类型")
+        if policy is ShedPolicy.DROP_BY_PRIORITY and priority_key is None:
+            raise ValueError(f"使用 {policy} 策略时，必须提供事件重要程度函数")
+
+        self.capacity = capacity
+        self.policy = policy
+        self.shed_types = tuple(shed_types)
+        self.priority_key = priority_key
+
+    def select_shed(self, queued: deque[Event], incoming: Event) -> Event:
+        match self.policy:
+            case ShedPolicy.BLOCK | ShedPolicy.DROP_NEWEST:
+                return incoming
+
+            case ShedPolicy.DROP_OLDEST:
+                return queued[0] if len(queued) else incoming
+
+            case ShedPolicy.DROP_BY_TYPE:
+                for ev in queued:
+                    if isinstance(ev, self.shed_types):
+                        return ev
+                if isinstance(incoming, self.shed_types) or not len(queued):
+                    return incoming
+                return queued[0]
+
+            case ShedPolicy.DROP_BY_PRIORITY:
+                key = cast(Callable[[Event], int], self.priority_key)
+                target, target_pri = incoming, key(incoming)
+                for ev in reversed(queued):
+                    pri = key(ev)
+                    if pri <= target_pri:
+                        target, target_pri = ev, pri
+                return target
+
+            case _:
+                assert_never(f"无效的通道过载策略 {self.policy}")
+
+
 class Dispatcher:
     HANDLED_FLOWS_FLAG = "HANDLED_FLOWS"
     DISPATCHED_FLAG = "DISPATCHED"
+    LANE_FLAG = "LANE"
 
-    def __init__(self) -> None:
+    def __init__(
+        self, batch: bool = False, limit: ChannelLimit | None = None, lanes: int | None = None
+    ) -> None:
         self.first_chan: EventChannel | None = None
+        self.batch = batch
+        self.limit = limit
+        self.lanes = ScopeLanes(self, lanes) if lanes is not None else None
+        self.shed_counts: dict[str, int] = {}
         self._channel_ctx = contextvars.Context()
 
     def __repr__(self) -> str:
         counts: dict[int, str] = {}
         chan = self.first_chan
         while chan is not None:
-            counts[chan.priority] = f"[flows:{len(chan.flow_que)}, events:{chan.event_que.qsize()}]"
+            counts[chan.priority] = (
+                f"[flows:{len(chan.router)}, events:{len(chan.event_que)}"
+                f", handling:{chan.handling}]"
+            )
             chan = chan.next
-        return f"{self.__class__.__name__}({counts})"
+        output = f"{self.__class__.__name__}({counts}, shed={sum(self.shed_counts.values())}"
+        if self.lanes is not None:
+            output += f", lanes={len(self.lanes)}"
+        return output + ")"
 
     def set_channel_ctx(self, ctx: contextvars.Context) -> None:
         self._channel_ctx = ctx
@@ -42,16 +132,16 @@ class Dispatcher:
 
             if self.first_chan is None:
                 self.first_chan = EventChannel(self, priority=lvl)
-                self.first_chan.flow_que.append(f)
+                self.first_chan.router.add(f)
 
             elif lvl == self.first_chan.priority:
-                self.first_chan.flow_que.append(f)
+                self.first_chan.router.add(f)
 
             elif lvl > self.first_chan.priority:
                 chan = EventChannel(self, priority=lvl)
                 chan.set_next(self.first_chan)
                 self.first_chan = chan
-                chan.flow_que.append(f)
+                chan.router.add(f)
 
             else:
                 chan = self.first_chan
@@ -59,13 +149,13 @@ class Dispatcher:
                     chan = chan.next
 
                 if lvl == chan.priority:
-                    chan.flow_que.append(f)
+                    chan.router.add(f)
                 else:
                     new_chan = EventChannel(self, priority=lvl)
                     chan_next = chan.next
                     new_chan.set_pre(chan)
                     new_chan.set_next(chan_next)
-                    new_chan.flow_que.append(f)
+                    new_chan.router.add(f)
 
             f._active = True
 
@@ -74,6 +164,9 @@ class Dispatcher:
     def remove(self, *flows: Flow) -> None:
         for f in flows:
             f._active = False
+            chan = self._find_chan(f.priority)
+            if chan is not None:
+                chan.router.remove(f)
         logger.generic_lazy("以下处理流不再生效：%s", lambda: repr(flows), level=LogLevel.DEBUG)
 
     def update(self, priority: int, *flows: Flow) -> None:
@@ -85,27 +178,222 @@ class Dispatcher:
             f"以下处理流优先级更新为 {priority}：%s", lambda: repr(flows), level=LogLevel.DEBUG
         )
 
-    def broadcast(self, event: Event) -> None:
+    def _find_chan(self, priority: int) -> EventChannel | None:
+        chan = self.first_chan
+        while chan is not None and chan.priority > priority:
+            chan = chan.next
+        if chan is not None and chan.priority == priority:
+            return chan
+        return None
+
+    async def broadcast(self, event: Event) -> None:
+        if self.lanes is not None:
+            self.lanes.put(event)
+        else:
+            await self._enter(event)
+
+    async def _enter(self, event: Event) -> None:
         event.flag_set(self, self.HANDLED_FLOWS_FLAG, set())
-        if self.first_chan is not None:
-            self.first_chan.event_que.put_nowait(event)
+        while (chan := self.first_chan) is not None and chan.is_blocked():
+            await chan.wait_vacancy()
+
+        if chan is not None:
+            chan.put(event)
         else:
             logger.debug(f"此刻没有可用的事件处理流，事件 {event.id} 将被丢弃")
             self._mark_dispatched(event)
 
     def _mark_dispatched(self, event: Event) -> None:
         event.flag_set(self, self.DISPATCHED_FLAG)
+        self.settle(event)
+
+    def settle(self, event: Event) -> None:
+        """释放事件对所在分片的占用，使同一域的下一事件可以开始分发
+
+        事件分发完成时会自动释放。会话挂起时也会释放，以免挂起的会话与它等待的后续事件互相阻塞
+
+        :param event: 事件对象
+        """
+        fut: Future[None] | None = event.flag_get(self, self.LANE_FLAG, raise_exc=False)
+        if fut is not None and not fut.done():
+            fut.set_result(None)
+
+    def _shed(self, chan: EventChannel, event: Event) -> None:
+        name = event.__class__.__name__
+        self.shed_counts[name] = self.shed_counts.get(name, 0) + 1
+        logger.generic_lazy(
+            "%s",
+            lambda: f"pri={chan.priority} 通道已满，事件被丢弃：{repr(event)}",
+            level=LogLevel.DEBUG,
+        )
+        self._mark_dispatched(event)
+
+
+class ScopeLanes:
+    """按域分片的事件调度器
+
+    同一域（:attr:`.Event.scope`）的事件在同一分片中串行分发，前一事件释放分片后，后一事件才开始分发。
+    不同分片轮流取出事件，同时分发中的事件总数不超过并发上限。域为空的事件各自独占一个分片
+    """
+
+    def __init__(self, owner: Dispatcher, concurrency: int) -> None:
+        if concurrency < 1:
+            raise ValueError(f"分片并发上限必须为正整数，当前值：{concurrency}")
+        self.owner = owner
+        self.concurrency = concurrency
+        self.running = 0
+        self._lanes: dict[Hashable, deque[Event]] = {}
+        self._ready: deque[Hashable] = deque()
+
+    def __len__(self) -> int:
+        return len(self._lanes)
+
+    def put(self, event: Event) -> None:
+        key = event.scope if event.scope is not None else event
+        lane = self._lanes.get(key)
+        if lane is None:
+            self._lanes[key] = deque((event,))
+            self._ready.append(key)
+            self._schedule()
+        else:
+            lane.append(event)
+
+    def _schedule(self) -> None:
+        while self.running < self.concurrency and len(self._ready):
+            key = self._ready.popleft()
+            self.running += 1
+            asyncio.create_task(self._run(key, self._lanes[key][0]))
+
+    async def _run(self, key: Hashable, event: Event) -> None:
+        try:
+            fut: Future[None] = asyncio.get_running_loop().create_future()
+            event.flag_set(self.owner, self.owner.LANE_FLAG, fut)
+            await self.owner._enter(event)
+            await fut
+        finally:
+            self.running -= 1
+            lane = self._lanes[key]
+            lane.popleft()
+            # 仍有事件的分片排到队尾，各分片由此轮流获得执行机会
+            if len(lane):
+                self._ready.append(key)
+            else:
+                self._lanes.pop(key)
+            self._schedule()
+
+
+class FlowRouter:
+    """处理流路由表
+
+    按处理流声明的路由预筛选条件（事件类型、协议、文本前缀）建立索引，
+    分发时只取出可能处理该事件的处理流。未声明条件的处理流位于兜底桶中，总是会被取出
+    """
+
+    def __init__(self) -> None:
+        self._flows: dict[Flow, None] = {}
+        self._cache: dict[
+            tuple[type[Event], str],
+            tuple[tuple[Flow, ...], dict[str, list[tuple[Flow, tuple[str, ...]]]]],
+        ] = {}
+
+    def __len__(self) -> int:
+        return len(self._flows)
+
+    def add(self, flow: Flow) -> None:
+        self._flows[flow] = None
+        self._cache.clear()
+
+    def remove(self, flow: Flow) -> None:
+        if self._flows.pop(flow, False) is not False:
+            self._cache.clear()
+
+    def route(self, event: Event) -> list[Flow]:
+        key = (event.__class__, event.protocol)
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = self._cache[key] = self._build(*key)
+
+        plains, prefixed = entry
+        flows = list(plains)
+        if len(prefixed):
+            text = cast(TextEvent, event).text
+            for f, prefixes in prefixed.get(text[:1], ()):
+                for p in prefixes:
+                    if text.startswith(p):
+                        flows.append(f)
+                        break
+        return flows
+
+    def _build(
+        self, etype: type[Event], protocol: str
+    ) -> tuple[tuple[Flow, ...], dict[str, list[tuple[Flow, tuple[str, ...]]]]]:
+        plains: list[Flow] = []
+        prefixed: dict[str, list[tuple[Flow, tuple[str, ...]]]] = {}
+        is_text = issubclass(etype, TextEvent)
+
+        for f in self._flows:
+            if f._route_etype is not None and not issubclass(etype, f._route_etype):
+                continue
+            if f._route_protocol is not None and f._route_protocol != protocol:
+                continue
+
+            prefixes = f._route_prefixes
+            # 非文本事件无法按前缀筛选，空前缀匹配任何文本，它们都交由守卫函数判断
+            if prefixes is None or not is_text or "" in prefixes:
+                plains.append(f)
+                continue
+            for char in {p[0] for p in prefixes}:
+                prefixed.setdefault(char, []).append((f, prefixes))
+
+        return tuple(plains), prefixed
+
+
+class EventQueue:
+    """单消费者的事件队列，支持移除任意位置的事件以实现丢弃策略"""
+
+    def __init__(self) -> None:
+        self.events: deque[Event] = deque()
+        self._waiter: Future[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def put(self, event: Event) -> None:
+        self.events.append(event)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def remove(self, event: Event) -> None:
+        self.events.remove(event)
+
+    def take(self, num: int) -> list[Event]:
+        if num >= len(self.events):
+            events = list(self.events)
+            self.events.clear()
+            return events
+        return [self.events.popleft() for _ in range(num)]
+
+    async def wait(self) -> None:
+        while not len(self.events):
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
 
 
 class EventChannel:
     def __init__(self, owner: Dispatcher, priority: int) -> None:
         self.owner = owner
-        self.event_que: Queue[Event] = Queue()
-        self.flow_que: deque[Flow] = deque()
+        self.event_que = EventQueue()
+        self.router = FlowRouter()
         self.priority = priority
+        # 已从队列取出，但还未离开本通道的事件数
+        self.handling = 0
 
         self.pre: EventChannel | None = None
         self.next: EventChannel | None = None
+        self._vacancy_waiters: list[Future[None]] = []
 
         # 不要把 channel_ctx 先赋值给其他变量，后续再引用此变量，会导致上下文丢失
         if is_runner_running():
@@ -127,60 +415,123 @@ class EventChannel:
         if self.next is not None:
             self.next.pre = self
 
-    async def run(self) -> None:
-        handle_tasks: list[Task] = []
-        events: list[Event] = []
-        valid_flows: list[Flow] = []
+    def is_full(self) -> bool:
+        limit = self.owner.limit
+        return limit is not None and len(self.event_que) + self.handling >= limit.capacity
+
+    def is_blocked(self) -> bool:
+        limit = self.owner.limit
+        return limit is not None and limit.policy is ShedPolicy.BLOCK and self.is_full()
+
+    async def wait_vacancy(self) -> None:
+        fut: Future[None] = asyncio.get_running_loop().create_future()
+        self._vacancy_waiters.append(fut)
+        await fut
+
+    def _notify_vacancy(self) -> None:
+        for fut in self._vacancy_waiters:
+            if not fut.done():
+                fut.set_result(None)
+        self._vacancy_waiters.clear()
+
+    def put(self, event: Event) -> None:
+        limit = self.owner.limit
+        if limit is None or limit.policy is ShedPolicy.BLOCK or not self.is_full():
+            self.event_que.put(event)
+            return
+
+        shed = limit.select_shed(self.event_que.events, event)
+        if shed is not event:
+            self.event_que.remove(shed)
+            self.event_que.put(event)
+        self.owner._shed(self, shed)
+
+    def _release(self, num: int = 1) -> None:
+        self.handling -= num
+        if len(self._vacancy_waiters):
+            self._notify_vacancy()
 
+    async def run(self) -> None:
         while True:
-            events.clear()
-            if self.event_que.qsize() == 0:
-                ev = await self.event_que.get()
-                events.append(ev)
-            for _ in range(self.event_que.qsize()):
-                events.append(self.event_que.get_nowait())
+            await self.event_que.wait()
+            limit = self.owner.limit
+            if limit is None:
+                events = self.event_que.take(len(self.event_que))
+            elif self.handling < limit.capacity:
+                events = self.event_que.take(limit.capacity - self.handling)
+            else:
+                await self.wait_vacancy()
+                continue
 
+            self.handling += len(events)
             logger.debug(f"pri={self.priority} 通道开始处理 {len(events)} 个事件")
-            for ev in events:
-                handle_tasks.clear()
-                valid_flows.clear()
-
-                if len(self.flow_que) == 0:
-                    self._dispose(*events)
-                    return
-
-                for _ in range(len(self.flow_que)):
-                    handled_fs: set[Flow] = ev.flag_get(self.owner, self.owner.HANDLED_FLOWS_FLAG)
-                    f = self.flow_que.popleft()
-                    if f._active and f.priority == self.priority:
-                        if f not in handled_fs:
-                            handle_tasks.append(asyncio.create_task(f._handle(ev)))
-                            handled_fs.add(f)
-                        valid_flows.append(f)
-
-                for f in valid_flows:
-                    self.flow_que.append(f)
-                if len(valid_flows):
-                    coro = self._determine_spread(ev, handle_tasks)
-                    asyncio.create_task(coro)
-                else:
-                    self._dispose(*events)
-                    return
+            if self.owner.batch:
+                alive = self._handle_batch(events)
+            else:
+                alive = self._handle_each(events)
+            if not alive:
+                return
+
+    def _handle_each(self, events: list[Event]) -> bool:
+        for idx, ev in enumerate(events):
+            if len(self.router) == 0:
+                self._dispose(*events[idx:])
+                return False
+
+            handle_tasks = [asyncio.create_task(f._handle(ev)) for f in self._pick_flows(ev)]
+            asyncio.create_task(self._determine_spread(ev, handle_tasks))
+        return True
+
+    def _handle_batch(self, events: list[Event]) -> bool:
+        if len(self.router) == 0:
+            self._dispose(*events)
+            return False
+
+        # 整批事件作为一个调度单元：不再为每个处理流包装等待任务，批内所有事件处理完成后统一传播
+        futs: list[Future[None]] = []
+        for ev in events:
+            futs.extend(f._start(ev) for f in self._pick_flows(ev))
+        asyncio.create_task(self._determine_batch_spread(tuple(events), futs))
+        return True
+
+    def _pick_flows(self, event: Event) -> list[Flow]:
+        flows: list[Flow] = []
+        handled_fs: set[Flow] = event.flag_get(self.owner, self.owner.HANDLED_FLOWS_FLAG)
+        for f in self.router.route(event):
+            if not f._active or f.priority != self.priority:
+                self.router.remove(f)
+                continue
+            if f not in handled_fs:
+                flows.append(f)
+                handled_fs.add(f)
+        return flows
 
     def _dispose(self, *events: Event) -> None:
         if self.pre is not None:
             self.pre.set_next(self.next)
-        if self.next is not None:
-            for ev in events:
-                self._try_pass_event(ev)
         if self is self.owner.first_chan:
             self.owner.first_chan = self.next
 
+        for ev in (*events, *self.event_que.take(len(self.event_que))):
+            self._try_pass_event(ev)
+        self._notify_vacancy()
         logger.debug(f"pri={self.priority} 通道没有可用处理流，已销毁")
 
+    async def _determine_batch_spread(
+        self, events: tuple[Event, ...], futs: list[Future[None]]
+    ) -> None:
+        if len(futs):
+            logger.debug(
+                f"pri={self.priority} 通道为 {len(events)} 个事件启动了 {len(futs)} 个处理流"
+            )
+            await asyncio.wait(futs)
+            logger.debug(f"pri={self.priority} 通道处理完成 {len(events)} 个事件")
+        for ev in events:
+            await self._pass_event(ev)
+
     async def _determine_spread(self, event: Event, handle_tasks: list[Task]) -> None:
         if not len(handle_tasks):
-            self._try_pass_event(event)
+            await self._pass_event(event)
             return
 
         logger.generic_lazy(
@@ -194,11 +545,21 @@ class EventChannel:
             lambda: f"pri={self.priority} 通道处理完成，事件：{repr(event)}",
             level=LogLevel.DEBUG,
         )
-        self._try_pass_event(event)
+        await self._pass_event(event)
+
+    async def _pass_event(self, event: Event) -> None:
+        # 下一通道阻塞时，事件继续占用本通道的容量，背压由此逐级传递到事件输入处
+        try:
+            if event.spread:
+                while (chan := self.next) is not None and chan.is_blocked():
+                    await chan.wait_vacancy()
+            self._try_pass_event(event)
+        finally:
+            self._release()
 
     def _try_pass_event(self, event: Event) -> None:
         if self.next is not None and event.spread:
-            self.next.event_que.put_nowait(event)
+            self.next.put(event)
             chan = self.next
             logger.generic_lazy(
                 "%s",
@@ -26,7 +26,7 @@ if TYPE_CHECKING:
     from . import adapter
     from .adapter import model
     from .bot.base import Bot
-    from .handle.base import Flow, FlowNode
+    from .handle.base import Flow, FlowNode, FlowPlan
     from .io import base as io_base
     from .io.base import OutSourceT
     from .log.base import GenericLogger
@@ -191,6 +191,8 @@ class FlowStatus:
         completion: "EventCompletion",
         records: FlowRecords | None = None,
         store: FlowStore | None = None,
+        plan: "FlowPlan | None" = None,
+        idx: int = -1,
     ) -> None:
         self.flow = flow
         self.node = node
@@ -198,6 +200,8 @@ class FlowStatus:
         self.completion = completion
         self.records = FlowRecords() if records is None else records
         self.store = FlowStore() if store is None else store
+        self.plan = plan
+        self.idx = idx
 
 
 class FlowCtx(Context[FlowStatus]):
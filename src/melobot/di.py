@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from asyncio import Lock
+from asyncio import Task, create_task, shield
 from dataclasses import dataclass
+from enum import Enum
 from functools import partial, wraps
-from inspect import Parameter, isawaitable, signature
-from types import BuiltinFunctionType, FunctionType, LambdaType, MethodType
+from inspect import Parameter, isawaitable, iscoroutinefunction, signature
+from time import monotonic
+from types import BuiltinFunctionType, FunctionType, LambdaType, MethodType, UnionType
 
 from typing_extensions import (
     TYPE_CHECKING,
@@ -14,6 +16,7 @@ from typing_extensions import (
     Callable,
     Generic,
     Sequence,
+    Union,
     cast,
     get_args,
     get_origin,
@@ -34,6 +37,22 @@ if TYPE_CHECKING:
 SENTINEL = object()
 
 
+def _get_type_checker(hint: Any) -> Callable[[Any], bool]:
+    # 普通类与普通类的联合直接使用 isinstance，其余注解才交给完整的类型检查
+    if get_origin(hint) is Annotated:
+        base, *metadatas = get_args(hint)
+        # 依赖选项只对依赖注入有意义，不影响类型检查
+        if all(isinstance(data, DepOption) for data in metadatas):
+            return _get_type_checker(base)
+    if isinstance(hint, type) and get_origin(hint) is None:
+        return lambda obj: isinstance(obj, hint)
+    if get_origin(hint) in (Union, UnionType):
+        types = get_args(hint)
+        if all(isinstance(t, type) and get_origin(t) is None for t in types):
+            return lambda obj: isinstance(obj, types)
+    return lambda obj: is_type(obj, hint)
+
+
 def _get_prefix(callable_name: str = "", arg_name: str = "") -> str:
     s = f"可调用对象 {callable_name!r} 的" if callable_name != "" else "可调用对象的"
     s += f"参数 {arg_name!r} " if arg_name != "" else "参数"
@@ -58,6 +77,22 @@ class DependNotMatched(BaseException):
             return f"{prefix}真实类型({self.real_type}) <=> 注解要求的类型({self.hint})"
 
 
+class DependsLifetime(Enum):
+    """依赖项缓存的生命周期枚举"""
+
+    #: 永久缓存
+    FOREVER = "forever"
+    #: 在同一事件的处理中缓存，处理同一事件的所有处理流共享缓存值
+    EVENT = "event"
+    #: 在一次处理流运行中缓存（流存储的生命周期）
+    FLOW = "flow"
+    #: 在同一会话中缓存（会话存储的生命周期）
+    SESSION = "session"
+
+
+_DI_CACHE = "__melobot_di_cache__"
+
+
 class Depends(Generic[T, U]):
     @overload
     def __init__(
@@ -66,6 +101,8 @@ class Depends(Generic[T, U]):
         sub_getter: None = None,
         cache: bool = False,
         recursive: bool = True,
+        lifetime: DependsLifetime | None = None,
+        ttl: float | None = None,
     ) -> None: ...
 
     @overload
@@ -75,6 +112,8 @@ class Depends(Generic[T, U]):
         sub_getter: SyncOrAsyncCallable[[U], T],
         cache: bool = False,
         recursive: bool = True,
+        lifetime: DependsLifetime | None = None,
+        ttl: float | None = None,
     ) -> None: ...
 
     def __init__(
@@ -83,13 +122,19 @@ class Depends(Generic[T, U]):
         sub_getter: SyncOrAsyncCallable[[Any], Any] | None = None,
         cache: bool = False,
         recursive: bool = True,
+        lifetime: DependsLifetime | None = None,
+        ttl: float | None = None,
     ) -> None:
         """初始化一个依赖项
 
         :param dep: 依赖来源（可调用对象，异步可调用对象，或依赖项）
         :param sub_getter: 子获取器（可调用对象，异步可调用对象或空），在获得依赖之后，于其上继续获取
-        :param cache: 是否启用缓存
+        :param cache: 是否启用缓存（永久缓存，等价于 `lifetime=DependsLifetime.FOREVER`）
         :param recursive: 是否启用递归满足（默认启用，如果 `dep` 和 `sub_getter` 为可调用对象，会自动被 {func}`.inject_deps` 装饰；关闭可节约性能）
+        :param lifetime:
+            缓存的生命周期，提供后启用缓存。同一生命周期内，并发的满足过程也只会获取一次依赖。
+            不在生命周期对应的上下文中（例如事件生命周期，但不在处理流中）时，不使用缓存
+        :param ttl: 缓存的有效秒数，为空则在生命周期内一直有效。只提供此参数时，生命周期为永久
         """
         super().__init__()
         self.ref: Depends[T] | None
@@ -112,8 +157,13 @@ class Depends(Generic[T, U]):
         else:
             self.sub_getter = to_async(sub_getter)
 
-        self._lock = Lock() if cache else None
-        self._cached: Any = SENTINEL
+        if ttl is not None and ttl <= 0:
+            raise DependInitError(f"依赖项缓存的有效秒数必须为正数，当前值：{ttl}")
+        if lifetime is None and (cache or ttl is not None):
+            lifetime = DependsLifetime.FOREVER
+        self.lifetime = lifetime
+        self.ttl = ttl
+        self._cache_table: dict[Depends, tuple[Task[T], float]] = {}
 
     def __repr__(self) -> str:
         getter_str = f"getter={self.getter}" if self.getter is not None else ""
@@ -133,20 +183,62 @@ class Depends(Generic[T, U]):
             val = await self.sub_getter(val)
         return val
 
+    def _get_resolver(self) -> Callable[[], T] | None:
+        # 可以同步满足的依赖项返回同步的获取函数，依赖注入时以此跳过异步满足的过程
+        return None
+
     async def fulfill(self, dep_scope: dict[Depends, Any]) -> T:
-        if self._lock is None:
+        if self.lifetime is None:
             val = await self._fulfill(dep_scope)
-        elif self._cached is not SENTINEL:
-            val = self._cached
         else:
-            async with self._lock:
-                if self._cached is SENTINEL:
-                    self._cached = await self._fulfill(dep_scope)
-                val = self._cached
+            val = await self._cache_fulfill(dep_scope)
 
         dep_scope[self] = val
         return val
 
+    def _get_cache_table(self) -> dict[Depends, tuple[Task[T], float]] | None:
+        holder: Any
+        match self.lifetime:
+            case DependsLifetime.FOREVER:
+                return self._cache_table
+            case DependsLifetime.EVENT:
+                holder = FlowCtx().try_get_event()
+            case DependsLifetime.FLOW:
+                status = FlowCtx().try_get()
+                holder = status.store if status is not None else None
+            case DependsLifetime.SESSION:
+                session = SessionCtx().try_get()
+                holder = session.store if session is not None else None
+            case _:
+                raise DependResolveFailed(f"无效的依赖项缓存生命周期：{self.lifetime}")
+
+        if holder is None:
+            return None
+        table = holder.__dict__.get(_DI_CACHE)
+        if table is None:
+            table = holder.__dict__[_DI_CACHE] = {}
+        return cast(dict[Depends, tuple[Task[T], float]], table)
+
+    async def _cache_fulfill(self, dep_scope: dict[Depends, Any]) -> T:
+        table = self._get_cache_table()
+        if table is None:
+            return await self._fulfill(dep_scope)
+
+        entry = table.get(self)
+        if entry is None or (self.ttl is not None and monotonic() - entry[1] > self.ttl):
+            # 在独立任务中获取依赖，避免首个满足者被取消时，影响等待同一缓存值的其他满足者
+            task = create_task(self._fulfill(dep_scope))
+            entry = table[self] = (task, monotonic())
+            task.add_done_callback(partial(self._drop_failed, table, entry))
+        return await shield(entry[0])
+
+    def _drop_failed(
+        self, table: dict[Depends, tuple[Task[T], float]], entry: tuple[Task[T], float], _: Task
+    ) -> None:
+        task = entry[0]
+        if (task.cancelled() or task.exception() is not None) and table.get(self) is entry:
+            table.pop(self)
+
 
 class CbDepends(Depends, BetterABC, Generic[T]):
     """回调型依赖
@@ -202,7 +294,7 @@ class HintDepends(CbDepends):
             self.orig_getter = BotCtx().get
 
         elif is_subhint(hint, _get_adapter_type()):
-            self.orig_getter = cast(Callable[[], Any], partial(_adapter_get, self, hint))
+            self.orig_getter = cast(Callable[[], Any], partial(_adapter_get, self))
 
         elif is_subhint(hint, get_logger_type()):
             self.orig_getter = BotCtx().get_logger
@@ -228,6 +320,11 @@ class HintDepends(CbDepends):
         for data in self.metadatas:
             if isinstance(data, MatchEvent):
                 self._match_event = True
+        self._excludes = tuple(
+            t for data in self.metadatas if isinstance(data, Exclude) for t in data.types
+        )
+        self._check = _get_type_checker(hint)
+        self._reflect = False
 
         if self.orig_getter is None:
             raise DependInitError(
@@ -237,22 +334,41 @@ class HintDepends(CbDepends):
         for data in self.metadatas:
             if isinstance(data, Reflect):
                 self.orig_getter = cast(Callable[[], Any], partial(Reflection, self.orig_getter))
+                self._reflect = True
                 break
 
+        # 所有内置的依赖来源都是同步的上下文获取
+        self._sync_getter = cast(Callable[[], Any], self.orig_getter)
         super().__init__(self.orig_getter, cache=False, recursive=False)
 
+    def _get_resolver(self) -> Callable[[], Any] | None:
+        # 被子类改变满足逻辑时，不能使用同步的获取函数
+        cls = type(self)
+        if (
+            cls.fulfill is not CbDepends.fulfill
+            or cls.deps_callback is not HintDepends.deps_callback
+        ):
+            return None
+        return self._resolve
+
+    def _resolve(self) -> Any:
+        return self._verify(self._sync_getter())
+
     async def deps_callback(self, val: Any) -> Any:
+        return self._verify(val)
+
+    def _verify(self, val: Any) -> Any:
         ret = val
-        if isinstance(val, Reflection):
+        if self._reflect:
             val = val.__origin__
 
-        for data in self.metadatas:
-            if isinstance(data, Exclude):
-                if any(isinstance(val, t) for t in data.types):
+        if self._excludes and isinstance(val, self._excludes):
+            for data in self.metadatas:
+                if isinstance(data, Exclude) and isinstance(val, tuple(data.types)):
                     raise DependNotMatched(
                         Annotated[self.hint, data], type(val), self.callable_name, self.arg_name
                     )
-        if not is_type(val, self.hint):
+        if not self._check(val):
             raise DependNotMatched(self.hint, type(val), self.callable_name, self.arg_name)
         return ret
 
@@ -263,16 +379,11 @@ def _get_adapter_type() -> type["Adapter"]:
     return Adapter
 
 
-def _adapter_get(deps: HintDepends, hint: Any) -> "Adapter":
+def _adapter_get(deps: HintDepends) -> "Adapter":
+    hint = deps.hint
     if not deps._match_event:
-        if get_origin(hint) is Annotated:
-            args = get_args(hint)
-            if not len(args):
-                raise DependResolveFailed("可依赖注入的函数若使用 Annotated 注解，必须附加元数据")
-            adapter_type = args[0]
-        else:
-            adapter_type = hint
-
+        # HintDepends 初始化时已验证 Annotated 注解附加了元数据
+        adapter_type = get_args(hint)[0] if len(deps.metadatas) else hint
         adapter = BotCtx().get().get_adapter(adapter_type)
         if adapter is None:
             raise DependNotMatched(hint) from None
@@ -303,11 +414,14 @@ class BindDepends(Depends, Generic[T]):
 
         self._given_hint = hint
         self._anno_hint = SENTINEL
+        self._check = _get_type_checker(hint) if hint is not SENTINEL else None
 
     def bind(self, hint: Any, arg_name: str, callable_name: str) -> None:
         self._anno_hint = hint
         self.arg_name = arg_name
         self.callable_name = callable_name
+        if self.hint is not SENTINEL:
+            self._check = _get_type_checker(self.hint)
 
     @property
     def hint(self) -> Any:
@@ -325,12 +439,12 @@ class BindDepends(Depends, Generic[T]):
                 val = self.default
 
         if self.check_type:
-            if self.hint is SENTINEL:
+            if self._check is None:
                 raise DependResolveFailed(
                     f"{_get_prefix(self.callable_name, self.arg_name)}对应依赖项"
                     "启用了类型检查，必须在参数中提供类型或通过类型注解标明类型"
                 )
-            if not is_type(val, self.hint):
+            if not self._check(val):
                 raise DependNotMatched(self.hint, type(val), self.callable_name, self.arg_name)
         return cast(T, val)
 
@@ -357,6 +471,11 @@ class PendingHintDepends(BindDepends):
             Annotated[self.hint, self.dep_option], self.arg_name, self.callable_name
         )
 
+    def _get_resolver(self) -> Callable[[], Any] | None:
+        if type(self).fulfill is not PendingHintDepends.fulfill:
+            return None
+        return self.hint_dep._get_resolver()
+
     async def fulfill(self, dep_scope: dict[Depends, Any]) -> Any:
         return await self.hint_dep.fulfill(dep_scope)
 
@@ -599,10 +718,26 @@ def inject_deps(
         但需要所有内层装饰使用 :func:`functools.wraps` 进行包装，否则无法检测
     :return: 异步可调用对象，但保留原始参数和返回值签名
     """
+    # 装饰时编译得到的依赖位：（参数位置或参数名，依赖项，同步获取函数）
+    defaults: tuple[Any, ...] = ()
+    kw_defaults: dict[str, Any] = {}
+    slots: tuple[tuple[int, Depends, Callable[[], Any] | None], ...] = ()
+    kw_slots: tuple[tuple[str, Depends, Callable[[], Any] | None], ...] = ()
+    is_coro_func = iscoroutinefunction(injectee)
+
+    def call(args: Sequence[Any], kwargs: dict[str, Any]) -> Any:
+        try:
+            return injectee(*args, **kwargs)
+        except TypeError as e:
+            fname = get_obj_name(injectee, otype="callable")
+            raise DependResolveFailed(
+                f"依赖注入下的函数 {fname!r} 调用时发生错误：{e}。"
+                "可能是参数存在问题：传参个数不匹配，或提供了错误的类型注解；"
+                "或是函数内部逻辑错误。"
+            ) from None
 
-    @wraps(injectee)
-    async def inject_deps_wrapped(*args: Any, **kwargs: Any) -> T:
-        defaults: tuple[Any] = injectee.__dict__[_DI_DEFAULTS]
+    async def resolve_given(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        defaults: tuple[Any, ...] = injectee.__dict__[_DI_DEFAULTS]
         kw_defaults: dict[str, Any] = injectee.__dict__[_DI_KW_DEFAULTS]
         # 模拟已有参数替换默认值的情况
         _args = [*args, *defaults[len(args) :]]
@@ -618,20 +753,43 @@ def inject_deps(
             elem = _kwargs[k]
             if isinstance(elem, Depends):
                 _kwargs[k] = await elem.fulfill(dep_scope)
+        return call(_args, _kwargs)
 
-        try:
-            ret = injectee(*_args, **_kwargs)  # type: ignore[arg-type]
-        except TypeError as e:
-            fname = get_obj_name(injectee, otype="callable")
-            raise DependResolveFailed(
-                f"依赖注入下的函数 {fname!r} 调用时发生错误：{e}。"
-                "可能是参数存在问题：传参个数不匹配，或提供了错误的类型注解；"
-                "或是函数内部逻辑错误。"
-            ) from None
-
-        if isawaitable(ret):
-            return await ret
-        return ret
+    @wraps(injectee)
+    async def inject_deps_wrapped(*args: Any, **kwargs: Any) -> T:
+        if args or kwargs:
+            ret = await resolve_given(args, kwargs)
+        elif not slots and not kw_slots:
+            ret = call(defaults, kw_defaults)
+        else:
+            # 没有手动传参时（处理结点、钩子等的常见情况），按编译好的依赖位直接满足
+            _args = list(defaults)
+            _kwargs = kw_defaults.copy() if kw_slots else kw_defaults
+            dep_scope: dict[Depends, Any] = {}
+            for idx, dep, resolve in slots:
+                _args[idx] = resolve() if resolve is not None else await dep.fulfill(dep_scope)
+            for k, dep, resolve in kw_slots:
+                _kwargs[k] = resolve() if resolve is not None else await dep.fulfill(dep_scope)
+            ret = call(_args, _kwargs)
+
+        if is_coro_func or isawaitable(ret):
+            return cast(T, await ret)
+        return cast(T, ret)
+
+    def compile_slots() -> None:
+        nonlocal defaults, kw_defaults, slots, kw_slots
+        defaults = injectee.__dict__[_DI_DEFAULTS]
+        kw_defaults = injectee.__dict__[_DI_KW_DEFAULTS]
+        slots = tuple(
+            (idx, dep, dep._get_resolver())
+            for idx, dep in enumerate(defaults)
+            if isinstance(dep, Depends)
+        )
+        kw_slots = tuple(
+            (k, dep, dep._get_resolver())
+            for k, dep in kw_defaults.items()
+            if isinstance(dep, Depends)
+        )
 
     if avoid_repeat:
         f = injectee
@@ -645,16 +803,19 @@ def inject_deps(
 
     if isinstance(injectee, (FunctionType, MethodType)):
         _init_auto_deps(injectee, manual_arg)
+        compile_slots()
         return inject_deps_wrapped
     if isinstance(injectee, LambdaType):
         injectee.__dict__[_DI_DEFAULTS] = injectee.__defaults__ or ()
         injectee.__dict__[_DI_KW_DEFAULTS] = injectee.__kwdefaults__ or {}
         injectee.__dict__[_DI_INJECTED] = True
+        compile_slots()
         return inject_deps_wrapped
     if isinstance(injectee, partial):
         injectee.__dict__[_DI_DEFAULTS] = injectee.args or ()
         injectee.__dict__[_DI_KW_DEFAULTS] = injectee.keywords or {}
         injectee.__dict__[_DI_INJECTED] = True
+        compile_slots()
         return inject_deps_wrapped
     if isinstance(injectee, BuiltinFunctionType):
         raise DependInitError(f"内建函数 {injectee!r} 不支持依赖注入")
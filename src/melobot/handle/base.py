@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from asyncio import create_task, get_running_loop
+from asyncio import Future, create_task, get_running_loop
 
 from typing_extensions import Any, Callable, Iterable, NoReturn
 
@@ -46,10 +46,16 @@ class FlowNode:
         return f"{self.__class__.__name__}(name={self.name})"
 
     async def process(
-        self, flow: Flow, completion: EventCompletion, records: FlowRecords, store: FlowStore
+        self,
+        flow: Flow,
+        completion: EventCompletion,
+        records: FlowRecords,
+        store: FlowStore,
+        plan: FlowPlan | None = None,
+        idx: int = -1,
     ) -> None:
         # 对于每个处理结点，运行时都需要新的状态，但是依然复用必要的信息
-        status = FlowStatus(flow, self, completion, records, store)
+        status = FlowStatus(flow, self, completion, records, store, plan, idx)
         with _FLOW_CTX.unfold(status):
             try:
                 records.add(RecordStage.NODE_START, status=status)
@@ -67,6 +73,21 @@ class FlowNode:
                 await nextn()
 
 
+class FlowPlan:
+    """处理流编译后的执行计划
+
+    结点按拓扑序排列，后继结点以下标表示，运行时无需再查询图结构
+    """
+
+    __slots__ = ("nodes", "starts", "nexts")
+
+    def __init__(self, graph: DAGMapping[FlowNode]) -> None:
+        self.nodes = graph.topo_order()
+        indexes = {n: idx for idx, n in enumerate(self.nodes)}
+        self.starts = tuple(idx for idx, n in enumerate(self.nodes) if graph[n].in_deg == 0)
+        self.nexts = tuple(tuple(indexes[next_n] for next_n in graph[n].nexts) for n in self.nodes)
+
+
 class Flow:
     """处理流
 
@@ -94,6 +115,11 @@ class Flow:
         self._active = True
         self._guard = to_async(guard) if guard is not None else None
         self._recordable = False
+        self._plan: FlowPlan | None = None
+
+        self._route_etype: type[Event] | None = None
+        self._route_protocol: str | None = None
+        self._route_prefixes: tuple[str, ...] | None = None
 
     @staticmethod
     def from_graph(
@@ -104,6 +130,7 @@ class Flow:
     ) -> Flow:
         f = Flow(name, priority=priority, guard=guard)
         f.graph = graph
+        f._plan = None
         return f
 
     def __repr__(self) -> str:
@@ -146,10 +173,33 @@ class Flow:
         """
         self._guard = to_async(guard) if guard is not None else None
 
-    async def _handle(self, event: Event) -> None:
-        fut = get_running_loop().create_future()
+    def set_route(
+        self,
+        etype: type[Event] | None = None,
+        protocol: str | None = None,
+        prefixes: Iterable[str] | None = None,
+    ) -> None:
+        """设置处理流的路由预筛选条件
+
+        分发器依据这些条件建立路由索引，不满足条件的事件不会再为此处理流调度任务。
+        这些条件只应是处理流能处理事件的必要条件，它们不会替代守卫函数。
+        请在处理流添加到 bot 前设置
+
+        :param etype: 事件类型，为空时不限制
+        :param protocol: 事件遵循的协议，为空时不限制
+        :param prefixes: 文本事件的文本必须以其中之一起始，为空时不限制
+        """
+        self._route_etype = etype
+        self._route_protocol = protocol
+        self._route_prefixes = tuple(prefixes) if prefixes is not None else None
+
+    def _start(self, event: Event) -> Future[None]:
+        fut: Future[None] = get_running_loop().create_future()
         create_task(self._run(EventCompletion(event, fut, self)))
-        await fut
+        return fut
+
+    async def _handle(self, event: Event) -> None:
+        await self._start(event)
 
     async def _run(
         self,
@@ -174,17 +224,20 @@ class Flow:
                 )
                 return self._try_complete(completion)
 
-        starts = self.graph.starts
-        if not len(starts):
-            return self._try_complete(completion)
         try:
-            self.graph.verify()
+            plan = self._get_plan()
+            if not len(plan.starts):
+                return
             status.records.add(RecordStage.FLOW_START, status=status)
-            idx = 0
-            while idx < len(starts):
+            nodes, starts = plan.nodes, plan.starts
+            i = 0
+            while i < len(starts):
                 try:
-                    await starts[idx].process(self, completion, status.records, status.store)
-                    idx += 1
+                    idx = starts[i]
+                    await nodes[idx].process(
+                        self, completion, status.records, status.store, plan, idx
+                    )
+                    i += 1
                 except FlowRewound:
                     pass
             status.records.add(RecordStage.FLOW_FINISH, status=status)
@@ -205,6 +258,11 @@ class Flow:
         finally:
             self._try_complete(completion)
 
+    def _get_plan(self) -> FlowPlan:
+        if self._plan is None:
+            self._plan = FlowPlan(self.graph)
+        return self._plan
+
     def _try_complete(self, completion: EventCompletion) -> None:
         if completion.creator is self:
             if not completion.ctrl_by_session and not completion.completed.done():
@@ -234,6 +292,7 @@ class Flow:
             raise FlowError(f"{_from} 不是有效的流结点")
         if to is not None and not isinstance(to, FlowNode):
             raise FlowError(f"{to} 既不是有效的流结点，又不是空值")
+        self._plan = None
         return self.graph.add(_from, to)
 
     def start(self, node: FlowNode) -> FlowNode:
@@ -326,15 +385,20 @@ async def nextn() -> None:
         raise FlowError("此时不在活动的处理结点中，无法调用下一处理结点")
     if not status.next_valid:
         return
+    plan = status.plan
+    if plan is None:
+        plan = status.plan = status.flow._get_plan()
+        status.idx = plan.nodes.index(n)
     try:
-        nexts = status.flow.graph[n].nexts
-        idx = 0
-        while idx < len(nexts):
+        nodes, nexts = plan.nodes, plan.nexts[status.idx]
+        i = 0
+        while i < len(nexts):
             try:
-                await nexts[idx].process(
-                    status.flow, status.completion, status.records, status.store
+                idx = nexts[i]
+                await nodes[idx].process(
+                    status.flow, status.completion, status.records, status.store, plan, idx
                 )
-                idx += 1
+                i += 1
             except FlowRewound:
                 pass
     finally:
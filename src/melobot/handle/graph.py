@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
 from itertools import tee
 
@@ -35,13 +36,15 @@ class DAGMapping(Generic[T]):
         self.name = name
         self.map: dict[T, NodeInfo[T]] = {}
         self._verified = False
+        self._order: tuple[T, ...] = ()
 
         _edges = tuple(
             tuple((elem,) if not _is_iterable(elem) else elem for elem in emap) for emap in edges
         )
         edge_pairs = self._get_edges(_edges)
+        # 批量构建时不逐条检查环路，最后统一验证
         for n1, n2 in edge_pairs:
-            self.add(n1, n2)
+            self._add(n1, n2)
         self.verify()
 
     def __bool__(self) -> bool:
@@ -68,7 +71,8 @@ class DAGMapping(Generic[T]):
         return tuple(n for n, info in self.map.items() if info.out_deg == 0)
 
     def _get_edges(self, edge_maps: Sequence[Sequence[Iterable[T]]]) -> list[tuple[T, T]]:
-        edges: list[tuple[T, T]] = []
+        # 字典作为有序集合去重，保持边的添加顺序
+        edges: dict[tuple[T, T], None] = {}
 
         for emap in edge_maps:
             iter1, iter2 = tee(emap, 2)
@@ -78,17 +82,40 @@ class DAGMapping(Generic[T]):
                 continue
             if len(emap) == 1:
                 for n in emap[0]:
-                    self.add(n, None)
+                    self._add(n, None)
                 continue
 
             for from_seq, to_seq in zip(iter1, iter2):
                 for n1 in from_seq:
                     for n2 in to_seq:
-                        if (n1, n2) not in edges:
-                            edges.append((n1, n2))
-        return edges
+                        edges[(n1, n2)] = None
+        return list(edges)
 
     def add(self, _from: T, to: T | None) -> None:
+        if to is not None and self._reachable(to, _from):
+            raise ValueError(f"名为 {self.name} 的图结构中存在环路")
+        self._add(_from, to)
+
+    def _reachable(self, src: T, dst: T) -> bool:
+        if src == dst:
+            return True
+        # 新结点或无后继结点不可能到达其他结点，这是逐条构建时的常见情况
+        info = self.map.get(src)
+        if info is None or not len(info.nexts) or dst not in self.map:
+            return False
+
+        visited = {src}
+        stack = list(info.nexts)
+        while len(stack):
+            n = stack.pop()
+            if n == dst:
+                return True
+            if n not in visited:
+                visited.add(n)
+                stack.extend(self.map[n].nexts)
+        return False
+
+    def _add(self, _from: T, to: T | None) -> None:
         from_info = self.map.setdefault(_from, NodeInfo([], 0, 0))
         if to is not None:
             to_info = self.map.setdefault(to, NodeInfo([], 0, 0))
@@ -101,7 +128,6 @@ class DAGMapping(Generic[T]):
         if self._verified:
             return
 
-        graph = {n: info.copy() for n, info in self.map.items()}
         type_set = {type(n) for n in self.map}
         if len(type_set) > 1:
             type_dic: dict[type, list[Any]] = {}
@@ -113,18 +139,27 @@ class DAGMapping(Generic[T]):
                 f"每种类型的结点如下：{dict(sorted(type_dic.items(), key=lambda x: len(x[1])))}"
             )
 
-        while len(graph):
-            for n, info in graph.items():
-                nexts, in_deg = info.nexts, info.in_deg
-                if in_deg == 0:
-                    graph.pop(n)
-                    for next_n in nexts:
-                        graph[next_n].in_deg -= 1
-                    break
-            else:
-                raise ValueError(f"名为 {self.name} 的图结构中存在环路")
+        # Kahn 算法：拓扑排序未能取出所有结点时，剩余结点中必然存在环路
+        in_degs = {n: info.in_deg for n, info in self.map.items()}
+        queue = deque(n for n, deg in in_degs.items() if deg == 0)
+        order: list[T] = []
+        while len(queue):
+            n = queue.popleft()
+            order.append(n)
+            for next_n in self.map[n].nexts:
+                in_degs[next_n] -= 1
+                if in_degs[next_n] == 0:
+                    queue.append(next_n)
+        if len(order) != len(self.map):
+            raise ValueError(f"名为 {self.name} 的图结构中存在环路")
+
+        self._order = tuple(order)
         self._verified = True
 
+    def topo_order(self) -> tuple[T, ...]:
+        self.verify()
+        return self._order
+
     def link(self, graph: DAGMapping[T], name: str) -> DAGMapping[T]:
         _froms = self.ends
         _tos = graph.starts
@@ -133,10 +168,10 @@ class DAGMapping(Generic[T]):
 
         for n1, info in (self.map | graph.map).items():
             if not len(info.nexts):
-                new_graph.add(n1, None)
+                new_graph._add(n1, None)
                 continue
             for n2 in info.nexts:
-                new_graph.add(n1, n2)
+                new_graph._add(n1, n2)
 
         new_graph.verify()
         return new_graph
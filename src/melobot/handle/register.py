@@ -134,6 +134,8 @@ class FlowDecorator:
         temp: bool = False,
         decos: Sequence[Callable[[Callable], Callable]] | None = None,
         rule: Rule[Event] | type[Rule[Event]] | None = None,
+        etype: type[Event] | None = None,
+        protocol: str | None = None,
     ) -> None:
         """处理流装饰器
 
@@ -147,6 +149,8 @@ class FlowDecorator:
         :param rule:
             会话规则或会话规则类（提供类对象时运行无参实例化并缓存单例，
             因此不要在多个流装饰器中使用同一个类对象，除非这是你的本意）
+        :param etype: 事件类型，为空时不先校验类型。同时作为分发器的路由预筛选条件
+        :param protocol: 事件遵循的协议，为空时不校验。同时作为分发器的路由预筛选条件
         """
         self.checker: Checker | None
         if callable(checker):
@@ -156,6 +160,8 @@ class FlowDecorator:
 
         self.matcher = matcher
         self.parser = parser
+        self.etype = etype
+        self.protocol = protocol
 
         self._priority = priority
         self._block = block
@@ -178,9 +184,24 @@ class FlowDecorator:
         self._flow = Flow(
             f"{FlowDecorator.__name__}[{n.name}]", (n,), priority=self._priority, guard=self._guard
         )
+        self._flow.set_route(self.etype, self.protocol, self._get_prefixes())
         return self._flow
 
+    def _get_prefixes(self) -> tuple[str, ...] | None:
+        # 只有起始匹配器能安全地推导出前缀条件，其他匹配器交由守卫函数判断
+        matcher = self.matcher
+        if not isinstance(matcher, StartMatcher) or matcher.mode is LogicMode.NOT:
+            return None
+        if isinstance(matcher.target, str):
+            return (matcher.target,)
+        return tuple(matcher.target)
+
     async def _guard(self, event: Event) -> bool:
+        if self.etype is not None and not isinstance(event, self.etype):
+            return False
+        if self.protocol is not None and event.protocol != self.protocol:
+            return False
+
         if self.checker:
             status = await self.checker.check(event)
             if not status:
@@ -312,6 +333,7 @@ def on_text(
         temp,
         decos,
         DefaultRule() if legacy_session else None,
+        etype=TextEvent,
     )
 
 
@@ -354,6 +376,7 @@ def on_command(
         temp,
         decos,
         DefaultRule() if legacy_session else None,
+        etype=TextEvent,
     )
 
 
@@ -392,6 +415,7 @@ def on_start_match(
         temp,
         decos,
         DefaultRule() if legacy_session else None,
+        etype=TextEvent,
     )
 
 
@@ -430,6 +454,7 @@ def on_contain_match(
         temp,
         decos,
         DefaultRule() if legacy_session else None,
+        etype=TextEvent,
     )
 
 
@@ -468,6 +493,7 @@ def on_full_match(
         temp,
         decos,
         DefaultRule() if legacy_session else None,
+        etype=TextEvent,
     )
 
 
@@ -506,6 +532,7 @@ def on_end_match(
         temp,
         decos,
         DefaultRule() if legacy_session else None,
+        etype=TextEvent,
     )
 
 
@@ -544,6 +571,7 @@ def on_regex_match(
         temp,
         decos,
         DefaultRule() if legacy_session else None,
+        etype=TextEvent,
     )
 
 
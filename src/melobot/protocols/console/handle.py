@@ -25,6 +25,7 @@ def on_event(
         temp=temp,
         decos=decos,
         rule=rule,  # type: ignore[arg-type]
+        etype=Event,
     )
 
 
@@ -47,4 +48,5 @@ def on_input(
         temp=temp,
         decos=decos,
         rule=rule,  # type: ignore[arg-type]
+        etype=StdinEvent,
     )
@@ -1,5 +1,3 @@
-import json
-
 from typing_extensions import Any, Iterable, Literal, Optional, TypedDict
 
 from melobot.adapter import Action as RootAction
@@ -7,6 +5,7 @@ from melobot.adapter.content import TextContent
 from melobot.handle import try_get_event
 
 from ..const import PROTOCOL_IDENTIFIER
+from ..io.serialize import get_json_serializer
 from .segment import NodeSegment, Segment, TextSegment
 
 
@@ -30,7 +29,7 @@ class Action(RootAction):
         return obj
 
     def flatten(self) -> str:
-        return json.dumps(self.extract(), ensure_ascii=False)
+        return get_json_serializer().dumps(self.extract())
 
 
 def msgs_to_dicts(
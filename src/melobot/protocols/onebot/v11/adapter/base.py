@@ -61,9 +61,13 @@ class ValidateHandleMixin:
 
 
 class EventFactory(AbstractEventFactory[InPacket, ev.Event], ValidateHandleMixin):
+    def __init__(self, trusted: bool = False) -> None:
+        super().__init__()
+        self._resolve = ev.Event.resolve_trusted if trusted else ev.Event.resolve
+
     async def create(self, packet: InPacket) -> ev.Event:
         try:
-            event = await self.validate_handle(packet.data, ev.Event.resolve)
+            event = await self.validate_handle(packet.data, self._resolve)
             if isinstance(packet, DownstreamCallInPacket):
                 asyncio.create_task(get_bot().wait_finish(event)).add_done_callback(
                     lambda _: packet.to_upstream.set_result(
@@ -106,8 +110,16 @@ class EchoFactory(AbstractEchoFactory[EchoPacket, ec.Echo], ValidateHandleMixin)
 class Adapter(
     RootAdapter[EventFactory, OutputFactory, EchoFactory, ac.Action, BaseIOSource, BaseIOSource]
 ):
-    def __init__(self) -> None:
-        super().__init__(PROTOCOL_IDENTIFIER, EventFactory(), OutputFactory(), EchoFactory())
+    def __init__(self, trusted_event: bool = False) -> None:
+        """初始化 OneBot v11 适配器
+
+        :param trusted_event:
+            是否信任上游实现的事件数据。信任时跳过事件数据验证，
+            消息事件的消息段、文本、发送者等属性延迟到首次访问时解析
+        """
+        super().__init__(
+            PROTOCOL_IDENTIFIER, EventFactory(trusted_event), OutputFactory(), EchoFactory()
+        )
         self._hook_bus.set_tag("OB11 适配器")
 
     def when_validate_error(self, validate_type: Literal["event", "echo"]) -> Callable[
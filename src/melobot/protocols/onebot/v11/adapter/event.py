@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from contextvars import ContextVar
+from functools import cached_property
+
 from pydantic import BaseModel
-from typing_extensions import Any, Literal, NoReturn, Sequence, cast
+from typing_extensions import Any, Literal, MutableSequence, NoReturn, Sequence, cast
 
 import melobot.protocols.onebot.v11.adapter.echo
 from melobot.adapter import Event as RootEvent
@@ -10,7 +13,9 @@ from melobot.adapter import content
 
 from ..const import PROTOCOL_IDENTIFIER
 from ..io.packet import ActionToUpstream, EchoToDownstream, EventToDownstream
-from .segment import Segment, TextSegment, seg_to_content
+from .segment import Segment, _LazySegments, seg_to_content
+
+_TRUSTED_BUILD: ContextVar[bool] = ContextVar("MELOBOT_OB11_TRUSTED_BUILD", default=False)
 
 
 class Event(RootEvent):
@@ -23,7 +28,10 @@ class Event(RootEvent):
         )
 
     def __init__(self, **event_data: Any) -> None:
-        self._model = self.Model(**event_data)
+        self._trusted = _TRUSTED_BUILD.get()
+        self._model = (
+            self.Model.model_construct(**event_data) if self._trusted else self.Model(**event_data)
+        )
         #: 时间戳
         self.time: int
 
@@ -59,6 +67,22 @@ class Event(RootEvent):
             return cls_map[etype].resolve(event_data)
         return cls(**event_data)
 
+    @classmethod
+    def resolve_trusted(cls, event_data: dict[str, Any]) -> Event:
+        """以信任模式解析事件
+
+        信任模式下不对事件数据进行验证，消息事件的消息内容、文本、发送者等属性在首次访问时才解析。
+        仅当上游实现可信时使用，数据有误时异常会推迟到访问对应属性时发出
+
+        :param event_data: 事件原始数据
+        :return: 事件对象
+        """
+        token = _TRUSTED_BUILD.set(True)
+        try:
+            return cls.resolve(event_data)
+        finally:
+            _TRUSTED_BUILD.reset(token)
+
     def is_message(self) -> bool:
         return self.post_type == "message"
 
@@ -96,24 +120,11 @@ class MessageEvent(RootTextEvent, Event):
         self._model: MessageEvent.Model
         self.post_type: Literal["message"]
         self.to_downstream: EventToDownstream
-        #: 消息内容（消息段表示）
-        self.message: list[Segment]
-        #: 消息发送者
-        self.sender: _MessageSender | _GroupMessageSender
-        #: 消息内容（通用内容表示）
-        self.contents: Sequence[content.Content] = []
         #: 消息内容（cq 字符串表示）
         self.raw_message: str
 
         self.scope: tuple[int, ...]
 
-        data = event_data
-        if isinstance(data["message"], str):
-            self.message = Segment.__resolve_cq__(data["raw_message"])
-        else:
-            self.message = [Segment.resolve(dic["type"], dic["data"]) for dic in data["message"]]
-        self.contents = list(c for c in map(seg_to_content, self.message) if c is not None)
-
         #: 消息类型
         self.message_type: Literal["private", "group"] | str = self._model.message_type
         #: 消息子类型
@@ -128,14 +139,44 @@ class MessageEvent(RootTextEvent, Event):
         #: 消息字体
         self.font: int = self._model.font
 
-        #: 消息内容
-        self.text = "".join(
-            seg.data["text"] for seg in self.message if isinstance(seg, TextSegment)
-        )
-        #: 消息内容行
-        self.textlines = "\n".join(
-            seg.data["text"] for seg in self.message if isinstance(seg, TextSegment)
-        ).split("\n")
+        # 移除基类初始化的空内容，改由 contents 属性在访问时解析
+        del self.contents
+        if not self._trusted:
+            # 非信任模式下立即提取文本，文本数据有误时在构建事件时就发出异常。
+            # 其他消息段仍然在首次访问时才解析
+            self.text
+
+    @cached_property
+    def _segments(self) -> _LazySegments:
+        data = self.raw
+        if isinstance(data["message"], str):
+            return _LazySegments.from_cq(data["raw_message"])
+        return _LazySegments(data["message"])
+
+    @property
+    def message(self) -> MutableSequence[Segment]:
+        """消息内容（消息段表示），消息段在首次访问时解析"""
+        return self._segments
+
+    @cached_property
+    def contents(self) -> Sequence[content.Content]:  # type: ignore[override]
+        """消息内容（通用内容表示）"""
+        return list(c for c in map(seg_to_content, self.message) if c is not None)
+
+    @cached_property
+    def text(self) -> str:  # type: ignore[override]
+        """消息内容"""
+        return self._segments.get_text()
+
+    @cached_property
+    def textlines(self) -> list[str]:  # type: ignore[override]
+        """消息内容行"""
+        return self.text.split("\n")
+
+    @cached_property
+    def sender(self) -> _MessageSender | _GroupMessageSender:
+        """消息发送者"""
+        return _MessageSender(**self.raw["sender"])
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(text={self.text!r}, sub_type={self.sub_type})"
@@ -254,10 +295,9 @@ class PrivateMessageEvent(MessageEvent):
     def __init__(self, **event_data: Any) -> None:
         super().__init__(**event_data)
 
-        #: 消息发送者
-        self.sender: _MessageSender
-        self.sender = _MessageSender(**event_data["sender"])
         self.scope = (-1, self.user_id)
+        if not self._trusted:
+            self.sender
 
         self._model: PrivateMessageEvent.Model
         #: 消息类型
@@ -265,6 +305,11 @@ class PrivateMessageEvent(MessageEvent):
         # 消息子类型
         self.sub_type: Literal["friend", "group", "other"]
 
+    @cached_property
+    def sender(self) -> _MessageSender:
+        """消息发送者"""
+        return _MessageSender(**self.raw["sender"])
+
 
 class _MessageAnonymous:
 
@@ -319,9 +364,8 @@ class GroupMessageEvent(MessageEvent):
     def __init__(self, **event_data: Any) -> None:
         super().__init__(**event_data)
 
-        #: 消息发送者
-        self.sender: _GroupMessageSender
-        self.sender = _GroupMessageSender(**event_data["sender"])
+        if not self._trusted:
+            self.sender
         #: 消息匿名信息段
         self.anonymous: _MessageAnonymous | None = (
             _MessageAnonymous(**event_data["anonymous"]) if event_data["anonymous"] else None
@@ -339,6 +383,11 @@ class GroupMessageEvent(MessageEvent):
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(text={self.text!r}, sub_type={self.sub_type})"
 
+    @cached_property
+    def sender(self) -> _GroupMessageSender:
+        """消息发送者"""
+        return _GroupMessageSender(**self.raw["sender"])
+
 
 class MetaEvent(Event):
 
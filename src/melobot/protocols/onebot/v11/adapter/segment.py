@@ -1,19 +1,18 @@
 from __future__ import annotations
 
 import base64
-import json
 import re
 import warnings
-from collections.abc import Mapping
-from itertools import chain, zip_longest
+from collections.abc import Mapping, MutableSequence
 
 from pydantic import BaseModel, Discriminator, Tag, create_model
 from typing_extensions import (
     Annotated,
     Any,
     Generic,
+    Iterable,
+    Iterator,
     Literal,
-    Match,
     NotRequired,
     Self,
     TypedDict,
@@ -26,9 +25,15 @@ from typing_extensions import (
 
 from melobot.adapter import content as mbcontent
 
+from ..io.serialize import get_json_serializer
+
 SegTypeT = TypeVar("SegTypeT", bound=str, default=Any)
 SegDataT = TypeVar("SegDataT", bound=Mapping[str, Any], default=Any)
 
+_CQ_REGEX = re.compile(r"\[CQ:.*?\]")
+# 与 _CQ_REGEX 匹配相同的内容，分组捕获 cq 码类型与参数部分
+_CQ_TOKEN_REGEX = re.compile(r"\[CQ:([^,\]\n]*)(?:,([^\]\n]*))?\]")
+
 
 def cq_filter_text(s: str) -> str:
     """cq 文本过滤函数
@@ -38,8 +43,7 @@ def cq_filter_text(s: str) -> str:
     :param s: cq 字符串
     :return: 纯文本消息部分
     """
-    regex = re.compile(r"\[CQ:.*?\]")
-    return regex.sub("", s)
+    return _CQ_REGEX.sub("", s)
 
 
 def cq_escape(text: str) -> str:
@@ -63,53 +67,48 @@ def cq_anti_escape(text: str) -> str:
     :param text: 需要逆转义的 cq 字符串
     :return: 逆转义特殊符号后的 cq 字符串
     """
+    if "&" not in text:
+        return text
     return (
         text.replace("&#44;", ",").replace("&#93;", "]").replace("&#91;", "[").replace("&amp;", "&")
     )
 
 
 def _cq_to_dicts(s: str) -> list[dict[str, Any]]:
-    cq_texts: list[str] = []
-
-    def replace_func(m: Match) -> str:
-        s, e = m.regs[0]
-        cq_texts.append(m.string[s:e])
-        return "\u0000"
-
-    cq_regex = re.compile(r"\[CQ:.*?\]")
+    # 单次扫描切分为：[文本, 类型, 参数, 文本, 类型, 参数, ..., 文本]
+    tokens = _CQ_TOKEN_REGEX.split(s)
+    if len(tokens) == 1:
+        # 只有一个文本消息段时，保持原样不做逆转义
+        return [{"type": "text", "data": {"text": s}}] if s else []
+    escape = not (len(tokens) == 4 and tokens[0] == tokens[3] == "" and tokens[1] == "text")
 
-    no_cq_str = cq_regex.sub(replace_func, s)
-    pure_texts = map(
-        lambda x: f"[CQ:text,text={x}]" if x != "" else x,
-        no_cq_str.split("\u0000"),
-    )
-    cq_entity_str: str = "".join(
-        chain.from_iterable(zip_longest(pure_texts, cq_texts, fillvalue=""))
-    )
-
-    cq_entity: list[str] = cq_entity_str.split("]")[:-1]
     dicts: list[dict[str, Any]] = []
-
-    for e in cq_entity:
-        cq_parts = e.split(",")
-        cq_type = cq_parts[0][4:]
+    text = tokens[0]
+    for i in range(1, len(tokens), 3):
+        if text:
+            if escape and "&" in text:
+                text = cq_anti_escape(text)
+            dicts.append({"type": "text", "data": {"text": text}})
+
+        cq_type, params = tokens[i], tokens[i + 1]
         cq_data: dict[str, Any] = {}
+        if params is not None:
+            for param_pair in params.split(","):
+                name, val = param_pair.split("=", maxsplit=1)
+                cq_data[name] = cq_anti_escape(val) if escape and "&" in val else val
 
-        for param_pair in cq_parts[1:]:
-            name, val = param_pair.split("=", maxsplit=1)
-            if len(cq_entity) == 1 and cq_type == "text":
-                cq_data[name] = val
-            else:
-                cq_data[name] = cq_anti_escape(val)
-
-        if cq_type == "node" and "content" in cq_data and isinstance(cq_data["content"], str):
+        if cq_type == "node" and isinstance(cq_data.get("content"), str):
             cq_data["content"] = [
                 Segment.resolve(seg_dict["type"], seg_dict["data"])
                 for seg_dict in _cq_to_dicts(cq_data["content"])
             ]
-
         dicts.append({"type": cq_type, "data": cq_data})
+        text = tokens[i + 2]
 
+    if text:
+        if escape and "&" in text:
+            text = cq_anti_escape(text)
+        dicts.append({"type": "text", "data": {"text": text}})
     return dicts
 
 
@@ -227,6 +226,9 @@ TypeT = TypeVar("TypeT", bound=str, default=Any)
 DataT = TypeVar("DataT", bound=Mapping[str, Any], default=Any)
 
 
+_SEG_CLS_MAPS: dict[type[Segment], dict[str, type[Segment]]] = {}
+
+
 class Segment(Generic[SegTypeT, SegDataT]):
 
     class Model(BaseModel):
@@ -240,6 +242,11 @@ class Segment(Generic[SegTypeT, SegDataT]):
             data={k: v for k, v in seg_data.items() if v is not None},
         )
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # 有新的消息段类型时，已缓存的类型映射失效
+        _SEG_CLS_MAPS.clear()
+
     @classmethod
     @final
     def add_type(
@@ -296,10 +303,12 @@ class Segment(Generic[SegTypeT, SegDataT]):
     @classmethod
     def resolve(cls, seg_type: Any, seg_data: Any) -> Segment:
         cls_name = f"{seg_type.lower().capitalize()}Segment"
-        cls_map = {
-            subcls.__name__: subcls
-            for subcls in cls.__subclasses__() + CustomSegCls.__subclasses__()
-        }
+        cls_map = _SEG_CLS_MAPS.get(cls)
+        if cls_map is None:
+            cls_map = _SEG_CLS_MAPS[cls] = {
+                subcls.__name__: subcls
+                for subcls in cls.__subclasses__() + CustomSegCls.__subclasses__()
+            }
         if cls_name in cls_map:
             return cls_map[cls_name].resolve(seg_type, seg_data)
         return cls(seg_type, **seg_data)
@@ -323,7 +332,88 @@ class Segment(Generic[SegTypeT, SegDataT]):
         return dic
 
     def to_json(self, force_str: bool = False) -> str:
-        return json.dumps(self.to_dict(force_str), ensure_ascii=False)
+        return get_json_serializer().dumps(self.to_dict(force_str))
+
+
+class _LazySegments(MutableSequence[Segment]):
+    """惰性解析的消息段列表
+
+    保存消息段的原始字典，只在索引或迭代到对应位置时才解析为消息段对象
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, seg_dicts: Iterable[dict[str, Any]]) -> None:
+        self._items: list[Segment | dict[str, Any]] = list(seg_dicts)
+
+    @classmethod
+    def from_cq(cls, cq_str: str) -> _LazySegments:
+        return cls(_cq_to_dicts(cq_str))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @overload
+    def __getitem__(self, index: int) -> Segment: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Segment]: ...
+
+    def __getitem__(self, index: int | slice) -> Segment | list[Segment]:
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self._items)))]
+        return self._get(range(len(self._items))[index])
+
+    @overload
+    def __setitem__(self, index: int, value: Segment) -> None: ...
+
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[Segment]) -> None: ...
+
+    def __setitem__(self, index: int | slice, value: Segment | Iterable[Segment]) -> None:
+        self._items[index] = value  # type: ignore[index,assignment]
+
+    def __delitem__(self, index: int | slice) -> None:
+        del self._items[index]
+
+    def insert(self, index: int, value: Segment) -> None:
+        self._items.insert(index, value)
+
+    def __iter__(self) -> Iterator[Segment]:
+        for i in range(len(self._items)):
+            yield self._get(i)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, _LazySegments)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def _get(self, idx: int) -> Segment:
+        item = self._items[idx]
+        if isinstance(item, Segment):
+            return item
+        seg = self._items[idx] = Segment.resolve(item["type"], item["data"])
+        return seg
+
+    def get_text(self) -> str:
+        # 直接读取文本消息段的原始字典，不解析其他消息段
+        texts: list[str] = []
+        for i, item in enumerate(self._items):
+            if isinstance(item, Segment):
+                if isinstance(item, TextSegment):
+                    texts.append(item.data["text"])
+                continue
+            if item["type"] != "text":
+                continue
+            text = item["data"]["text"]
+            if not isinstance(text, str):
+                # 交给消息段解析过程发出验证异常
+                text = self._get(i).data["text"]
+            texts.append(text)
+        return "".join(texts)
 
 
 class CustomSegCls(Segment[TypeT, DataT]):
@@ -786,8 +876,8 @@ class ContactSegment(Segment[Literal["contact"], _ContactFriendData | _ContactGr
         seg_data: _ContactFriendData | _ContactGroupData,
     ) -> ContactSegment:
         if seg_data["type"] == "qq":
-            return ContactFriendSegment(**seg_data)  # type:ignore[misc]
-        return ContactGroupSegment(**seg_data)  # type:ignore[misc]
+            return ContactFriendSegment(**seg_data)  # type: ignore[misc]
+        return ContactGroupSegment(**seg_data)  # type: ignore[misc]
 
 
 class ContactFriendSegment(ContactSegment):
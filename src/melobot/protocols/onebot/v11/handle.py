@@ -34,6 +34,7 @@ def on_event(
         temp=temp,
         decos=decos,
         rule=rule,  # type: ignore[arg-type]
+        etype=Event,
     )
 
 
@@ -56,6 +57,7 @@ def on_message(
         temp=temp,
         decos=decos,
         rule=DefaultRule() if legacy_session else None,
+        etype=MessageEvent,
     )
 
 
@@ -80,6 +82,7 @@ def on_at_qq(
         temp=temp,
         decos=decos,
         rule=DefaultRule() if legacy_session else None,
+        etype=Event,
     )
 
 
@@ -98,6 +101,7 @@ def on_request(
         temp=temp,
         decos=decos,
         rule=rule,  # type: ignore[arg-type]
+        etype=RequestEvent,
     )
 
 
@@ -116,6 +120,7 @@ def on_notice(
         temp=temp,
         decos=decos,
         rule=rule,  # type: ignore[arg-type]
+        etype=NoticeEvent,
     )
 
 
@@ -134,6 +139,7 @@ def on_meta(
         temp=temp,
         decos=decos,
         rule=rule,  # type: ignore[arg-type]
+        etype=MetaEvent,
     )
 
 
@@ -152,6 +158,7 @@ def on_downstream_call(
         temp=temp,
         decos=decos,
         rule=rule,  # type: ignore[arg-type]
+        etype=DownstreamCallEvent,
     )
 
 
@@ -170,4 +177,5 @@ def on_upstream_ret(
         temp=temp,
         decos=decos,
         rule=rule,  # type: ignore[arg-type]
+        etype=UpstreamRetEvent,
     )
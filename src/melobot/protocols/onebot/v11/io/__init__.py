@@ -1,5 +1,14 @@
 from .base import BaseIOSource
 from .http import HTTPDuplex
+from .limit import RateLimit, RateLimiter
+from .serialize import (
+    JSONSerializer,
+    MsgspecSerializer,
+    OrjsonSerializer,
+    StdJSONSerializer,
+    get_json_serializer,
+    set_json_serializer,
+)
 from .ws import WSClient, WSServer
 from .ws_rproxy import RProxyWSClient, RProxyWSServer
 
@@ -5,6 +5,7 @@ from typing_extensions import Any, Self
 from melobot.io import AbstractIOSource
 
 from ..const import PROTOCOL_IDENTIFIER
+from .limit import RateLimiter
 from .packet import EchoPacket, InPacket, OutPacket
 
 
@@ -12,12 +13,16 @@ class BaseIOSource(AbstractIOSource[InPacket, OutPacket, EchoPacket]):
     """
 
     :ivar float cd_time: 发送行为操作的冷却时间（防风控）
+    :ivar RateLimiter rate_limiter: 输出速率限制器
     """
 
-    def __init__(self, cd_time: float) -> None:
+    def __init__(self, cd_time: float, rate_limiter: RateLimiter | None = None) -> None:
         super().__init__()
         self.protocol = PROTOCOL_IDENTIFIER
         self.cd_time = cd_time if cd_time >= 0 else 0
+        self.rate_limiter = (
+            rate_limiter if rate_limiter is not None else RateLimiter.from_cd_time(self.cd_time)
+        )
         self._hook_bus.set_tag(f"{self.protocol}/{self.__class__.__name__}")
 
     @abstractmethod
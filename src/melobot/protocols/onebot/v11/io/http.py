@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import hmac
-import json
 import time
 from asyncio import Future
 
@@ -14,7 +13,9 @@ from melobot.log import LogLevel, logger
 from melobot.utils import truncate
 
 from .base import BaseIOSource, InstCounter
+from .limit import RateLimiter
 from .packet import EchoPacket, InPacket, OutPacket
+from .serialize import get_json_serializer
 
 
 class HTTPDuplex(InstCounter, BaseIOSource):
@@ -28,8 +29,9 @@ class HTTPDuplex(InstCounter, BaseIOSource):
         cd_time: float = 0,
         *,
         name: str | None = None,
+        rate_limiter: RateLimiter | None = None,
     ) -> None:
-        super().__init__(cd_time)
+        super().__init__(cd_time, rate_limiter)
         self.name = f"[OB11 双向 http #{self.INSTANCE_COUNT}]" if name is None else name
         self._hook_bus.set_tag(self.name)
 
@@ -43,8 +45,6 @@ class HTTPDuplex(InstCounter, BaseIOSource):
 
         self._tasks: list[asyncio.Task] = []
         self._in_buf: asyncio.Queue[InPacket] = asyncio.Queue()
-        self._out_buf: asyncio.Queue[OutPacket] = asyncio.Queue()
-        self._pre_send_time = time.time_ns()
 
         self._echo_table: dict[str, tuple[str, Future[EchoPacket]]] = {}
         self._opened = asyncio.Event()
@@ -71,7 +71,7 @@ class HTTPDuplex(InstCounter, BaseIOSource):
                 return aiohttp.web.Response(status=403)
 
         try:
-            raw = json.loads(data.decode())
+            raw = get_json_serializer().loads(data)
             if (
                 self._hook_bus.get_evoke_time(SourceLifeSpan.STARTED) != -1
                 and raw.get("post_type") == "meta_event"
@@ -99,11 +99,8 @@ class HTTPDuplex(InstCounter, BaseIOSource):
         while True:
             try:
                 await self._opened.wait()
-                out_packet = await self._out_buf.get()
-                wait_time = self.cd_time - ((time.time_ns() - self._pre_send_time) / 1e9)
-                await asyncio.sleep(wait_time)
+                out_packet = await self.rate_limiter.get()
                 asyncio.create_task(self._handle_output(out_packet))
-                self._pre_send_time = time.time_ns()
 
             except asyncio.CancelledError:
                 raise
@@ -116,24 +113,26 @@ class HTTPDuplex(InstCounter, BaseIOSource):
 
     async def _handle_output(self, packet: OutPacket) -> None:
         try:
-            headers: dict | None = None
+            headers = {"Content-Type": "application/json"}
             if self.access_token is not None:
-                headers = {"Authorization": f"Bearer {self.access_token}"}
+                headers["Authorization"] = f"Bearer {self.access_token}"
 
+            serializer = get_json_serializer()
             http_resp = await self.client_session.post(
                 f"{self.onebot_url}/{packet.action_type}",
-                json=packet.action_params,
+                data=serializer.dumps_bytes(packet.action_params),
                 headers=headers,
             )
             if packet.echo_id is None:
                 return
 
-            raw = await http_resp.json()
+            raw = await http_resp.json(loads=serializer.loads)
             echo_id = raw.get("echo")
             if echo_id in (None, ""):
                 return
 
             action_type, fut = self._echo_table.pop(echo_id)
+            self.rate_limiter.feedback(raw["retcode"])
             fut.set_result(
                 EchoPacket(
                     time=int(time.time()),
@@ -199,10 +198,10 @@ class HTTPDuplex(InstCounter, BaseIOSource):
         return await self._in_buf.get()
 
     async def output(self, packet: OutPacket) -> EchoPacket:
-        if self._out_buf.qsize() > 100:
+        if self.rate_limiter.full():
             logger.warning(f"{self.name} 输出缓冲区积压过多数据，请保证连接畅通或减少操作请求频率")
             raise RuntimeError("输出缓冲区溢出，操作请求被丢弃")
-        self._out_buf.put_nowait(packet)
+        self.rate_limiter.put_nowait(packet)
         if packet.echo_id is None:
             return EchoPacket(noecho=True)
 
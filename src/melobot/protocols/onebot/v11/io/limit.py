@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+
+from typing_extensions import Any, Collection, Hashable, Mapping
+
+from .packet import OutPacket
+
+#: 默认的行为操作优先级，值越小越先发送。未列出的行为操作使用 :attr:`RateLimiter.DEFAULT_PRIORITY`
+DEFAULT_ACTION_PRIORITIES: Mapping[str, int] = {
+    "delete_msg": 0,
+    "set_group_kick": 0,
+    "set_group_ban": 0,
+    "set_group_anonymous_ban": 0,
+    "set_group_whole_ban": 0,
+}
+
+
+class RateLimit:
+    """令牌桶形式的速率限制"""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """初始化一个速率限制
+
+        :param rate: 每秒补充的令牌数，即长期的平均发送速率
+        :param burst: 令牌桶的容量，即允许的突发发送数量
+        """
+        if rate <= 0:
+            raise ValueError(f"速率限制的速率必须为正数，当前值：{rate}")
+        if burst < 1:
+            raise ValueError(f"速率限制的突发数量必须为正整数，当前值：{burst}")
+        self.rate = rate
+        self.burst = burst
+
+
+class _TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "stamp")
+
+    def __init__(self, limit: RateLimit, now: float) -> None:
+        self.rate = limit.rate
+        self.burst = limit.burst
+        self.tokens = float(limit.burst)
+        self.stamp = now
+
+    def refill(self, now: float, factor: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate / factor)
+        self.stamp = now
+
+    def wait(self, now: float, factor: float) -> float:
+        self.refill(now, factor)
+        return 0 if self.tokens >= 1 else (1 - self.tokens) * factor / self.rate
+
+    def idle(self, now: float, factor: float) -> bool:
+        self.refill(now, factor)
+        return self.tokens >= self.burst
+
+
+def _get_target(packet: OutPacket) -> tuple[str, Any] | None:
+    params = packet.action_params
+    if (group_id := params.get("group_id")) is not None:
+        return ("group", group_id)
+    if (user_id := params.get("user_id")) is not None:
+        return ("user", user_id)
+    return None
+
+
+class RateLimiter:
+    """OneBot v11 源的输出速率限制器
+
+    待发送的行为操作按优先级分道排队，每次取出优先级最高、且所有相关令牌桶都有令牌的行为操作。
+    同一优先级、同一目标（群或用户）的行为操作保持先后顺序。
+    当行为操作的响应状态码属于需要退避的状态码时，所有速率成倍降低，此后每次正常响应逐步恢复
+    """
+
+    #: 未指定优先级的行为操作使用的优先级
+    DEFAULT_PRIORITY = 10
+    _TARGET_BUCKETS_GC_SIZE = 1024
+
+    def __init__(
+        self,
+        global_limit: RateLimit | None = None,
+        action_limits: Mapping[str, RateLimit] | None = None,
+        target_limit: RateLimit | None = None,
+        priorities: Mapping[str, int] | None = None,
+        max_pending: int = 100,
+        backoff_retcodes: Collection[int] = (),
+        max_backoff: float = 32,
+        recover_ratio: float = 0.9,
+    ) -> None:
+        """初始化一个输出速率限制器
+
+        :param global_limit: 所有行为操作共享的速率限制，为空时不限制
+        :param action_limits: 行为操作类型到速率限制的映射，未列出的行为操作类型不限制
+        :param target_limit: 每个目标（群或用户）各自的速率限制，为空时不限制
+        :param priorities: 行为操作类型到优先级的映射，值越小越先发送。为空时使用 :data:`DEFAULT_ACTION_PRIORITIES`
+        :param max_pending: 最多允许排队的行为操作数量
+        :param backoff_retcodes: 需要退避的响应状态码，收到时所有速率减半
+        :param max_backoff: 速率最多降低到原来的几分之一
+        :param recover_ratio: 退避后，每次收到其他状态码的响应时，降速倍数乘以此值，直到恢复原速率
+        """
+        if max_pending < 1:
+            raise ValueError(f"最大排队数量必须为正整数，当前值：{max_pending}")
+        if max_backoff < 1:
+            raise ValueError(f"最大退避倍数不能小于 1，当前值：{max_backoff}")
+        if not 0 < recover_ratio < 1:
+            raise ValueError(f"退避恢复比例必须在 0 到 1 之间，当前值：{recover_ratio}")
+
+        self.global_limit = global_limit
+        self.action_limits = dict(action_limits) if action_limits is not None else {}
+        self.target_limit = target_limit
+        self.priorities = dict(priorities if priorities is not None else DEFAULT_ACTION_PRIORITIES)
+        self.max_pending = max_pending
+        self.backoff_retcodes = frozenset(backoff_retcodes)
+        self.max_backoff = max_backoff
+        self.recover_ratio = recover_ratio
+
+        now = time.perf_counter()
+        self._global_bucket = _TokenBucket(global_limit, now) if global_limit is not None else None
+        self._action_buckets = {k: _TokenBucket(v, now) for k, v in self.action_limits.items()}
+        self._target_buckets: dict[Hashable, _TokenBucket] = {}
+        self._factor = 1.0
+
+        self._lanes: dict[int, deque[OutPacket]] = {}
+        self._lane_order: list[int] = []
+        self._size = 0
+        self._wakeup = asyncio.Event()
+
+    @classmethod
+    def from_cd_time(cls, cd_time: float) -> RateLimiter:
+        """按固定的冷却时间创建速率限制器
+
+        :param cd_time: 两次发送之间的最小间隔，不大于 0 时不限制
+        :return: 速率限制器
+        """
+        return cls(global_limit=RateLimit(1 / cd_time) if cd_time > 0 else None)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def backoff(self) -> float:
+        """当前速率降低的倍数，为 1 时表示没有退避"""
+        return self._factor
+
+    def full(self) -> bool:
+        """检查排队的行为操作是否已达到上限"""
+        return self._size >= self.max_pending
+
+    def put_nowait(self, packet: OutPacket) -> None:
+        """将待发送的行为操作加入排队
+
+        :param packet: 输出包
+        """
+        if self.full():
+            raise RuntimeError("输出缓冲区溢出，操作请求被丢弃")
+
+        priority = self.priorities.get(packet.action_type, self.DEFAULT_PRIORITY)
+        lane = self._lanes.get(priority)
+        if lane is None:
+            lane = self._lanes[priority] = deque()
+            self._lane_order = sorted(self._lanes)
+        lane.append(packet)
+        self._size += 1
+        self._wakeup.set()
+
+    async def get(self) -> OutPacket:
+        """等待并取出下一个允许发送的行为操作，此时会消耗对应的令牌
+
+        :return: 输出包
+        """
+        while True:
+            packet, wait = self._pick(time.perf_counter())
+            if packet is not None:
+                return packet
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def feedback(self, retcode: int) -> None:
+        """根据行为操作的响应状态码调整退避倍数
+
+        :param retcode: 响应状态码
+        """
+        if retcode in self.backoff_retcodes:
+            self._factor = min(self._factor * 2, self.max_backoff)
+        elif self._factor > 1:
+            self._factor = max(1.0, self._factor * self.recover_ratio)
+
+    def _get_target_bucket(self, target: Hashable, now: float) -> _TokenBucket:
+        bucket = self._target_buckets.get(target)
+        if bucket is not None:
+            return bucket
+
+        if len(self._target_buckets) >= self._TARGET_BUCKETS_GC_SIZE:
+            # 令牌已补满的桶与新建的桶等价，可以安全地丢弃
+            self._target_buckets = {
+                k: b for k, b in self._target_buckets.items() if not b.idle(now, self._factor)
+            }
+        bucket = self._target_buckets[target] = _TokenBucket(
+            self.target_limit, now  # type: ignore[arg-type]
+        )
+        return bucket
+
+    def _pick(self, now: float) -> tuple[OutPacket | None, float | None]:
+        if not self._size:
+            return None, None
+
+        factor = self._factor
+        if self._global_bucket is not None:
+            wait = self._global_bucket.wait(now, factor)
+            if wait > 0:
+                return None, wait
+
+        min_wait: float | None = None
+        for priority in self._lane_order:
+            lane = self._lanes[priority]
+            blocked: set[Hashable] = set()
+
+            for idx, packet in enumerate(lane):
+                target = _get_target(packet)
+                if target is not None and target in blocked:
+                    continue
+
+                buckets: list[_TokenBucket] = []
+                if (action_bucket := self._action_buckets.get(packet.action_type)) is not None:
+                    buckets.append(action_bucket)
+                if self.target_limit is not None and target is not None:
+                    buckets.append(self._get_target_bucket(target, now))
+
+                wait = max((b.wait(now, factor) for b in buckets), default=0)
+                if wait <= 0:
+                    for b in buckets:
+                        b.tokens -= 1
+                    if self._global_bucket is not None:
+                        self._global_bucket.tokens -= 1
+                    del lane[idx]
+                    self._size -= 1
+                    return packet, None
+
+                # 同一目标后续的行为操作不能越过被阻塞的行为操作，以保证发送顺序
+                if target is not None:
+                    blocked.add(target)
+                min_wait = wait if min_wait is None else min(min_wait, wait)
+
+        return None, min_wait
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import copy
-import json
 from dataclasses import dataclass, field
 
 from typing_extensions import Any, cast
@@ -12,6 +11,7 @@ from melobot.io import InPacket as RootInPak
 from melobot.io import OutPacket as RootOutPak
 
 from ..const import PROTOCOL_IDENTIFIER
+from .serialize import get_json_serializer
 
 
 @dataclass(kw_only=True)
@@ -41,6 +41,8 @@ class ShareToDownstreamInPacket(InPacket):  # type: ignore[override]
     to_downstream: asyncio.Future[EventToDownstream] = field(
         default_factory=lambda: asyncio.get_running_loop().create_future()
     )
+    # 来自上游的原始数据帧，数据未被修改时直接转发给下游
+    frame: str | bytes | None = None
 
 
 @dataclass(kw_only=True)
@@ -73,7 +75,8 @@ class ActionToUpstream:
         :param value: 新值
         """
         if not self._params_updated:
-            self.params = copy.deepcopy(self.params)
+            # 只替换顶层的值，浅拷贝即可避免修改原始数据
+            self.params = dict(self.params)
             self._params_updated = True
         self.params[key] = value
 
@@ -106,8 +109,8 @@ class ActionToUpstream:
 
     def get_json(self) -> str:
         """获得传递给上游的数据的 JSON 字符串表示"""
-        return json.dumps(
-            {"action": self.type, "params": self.params, "echo": self.echo}, ensure_ascii=False
+        return get_json_serializer().dumps(
+            {"action": self.type, "params": self.params, "echo": self.echo}
         )
 
 
@@ -115,6 +118,7 @@ class ToDownstream:
     def __init__(self, dic: dict[str, Any]) -> None:
         self._raw = dic
         self._updated = False
+        self._data_updated = False
         self._forbidden = False
 
     def set_param(self, key: str, value: Any) -> None:
@@ -124,7 +128,8 @@ class ToDownstream:
         :param value: 新值
         """
         if not self._updated:
-            self._raw = copy.deepcopy(self._raw)
+            # 只替换顶层的值，浅拷贝即可避免修改原始数据
+            self._raw = dict(self._raw)
             self._updated = True
         self._raw[key] = value
 
@@ -134,9 +139,13 @@ class ToDownstream:
         :param new_dic: 新的字典
         """
         if new_dic is not self._raw:
-            self._updated = True
+            self._updated = self._data_updated = True
         self._raw = new_dic
 
+    def is_updated(self) -> bool:
+        """检查传递给下游的数据是否被修改过"""
+        return self._updated
+
     def is_forbidden(self) -> bool:
         """检查数据是否被阻止传递给下游"""
         return self._forbidden
@@ -151,7 +160,7 @@ class ToDownstream:
 
     def get_json(self) -> str:
         """获得传递给下游的数据的 JSON 字符串表示"""
-        return json.dumps(self._raw, ensure_ascii=False)
+        return get_json_serializer().dumps(self._raw)
 
 
 class EventToDownstream(ToDownstream):
@@ -166,6 +175,9 @@ class EchoToDownstream(ToDownstream):
         :param value: 新值
         """
         if not self._updated:
-            self._raw = copy.deepcopy(self._raw)
+            self._raw = dict(self._raw)
             self._updated = True
+        if not self._data_updated:
+            self._raw["data"] = dict(self._raw["data"])
+            self._data_updated = True
         self._raw["data"][key] = value
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from importlib.util import find_spec
+
+from typing_extensions import Any, Literal, cast
+
+
+class JSONSerializer(ABC):
+    """JSON 序列化器抽象类
+
+    OneBot v11 的输入输出源、行为操作与上下游数据在序列化与反序列化时，统一使用当前设置的序列化器
+    """
+
+    #: 序列化器名称
+    name: str
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> str:
+        """序列化为字符串
+
+        :param obj: 需要序列化的对象
+        :return: JSON 字符串
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """序列化为 UTF-8 编码的字节串
+
+        :param obj: 需要序列化的对象
+        :return: JSON 字节串
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def loads(self, data: str | bytes) -> Any:
+        """反序列化字符串或 UTF-8 编码的字节串
+
+        :param data: JSON 字符串或字节串
+        :return: 反序列化结果
+        """
+        raise NotImplementedError
+
+
+class StdJSONSerializer(JSONSerializer):
+    """使用标准库 :mod:`json` 的序列化器"""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode()
+
+    def loads(self, data: str | bytes) -> Any:
+        return json.loads(data)
+
+
+_STD_SERIALIZER = StdJSONSerializer()
+
+
+class OrjsonSerializer(JSONSerializer):
+    """使用 orjson 的序列化器
+
+    orjson 无法序列化的数据（例如超出 64 位的整数），回退到标准库处理。
+    注意：反序列化时，超出 64 位的整数会被 orjson 解析为浮点数
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        self._opts = orjson.OPT_NON_STR_KEYS
+        self._errors = (orjson.JSONEncodeError, orjson.JSONDecodeError)
+
+    def dumps(self, obj: Any) -> str:
+        return self.dumps_bytes(obj).decode()
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        try:
+            return self._dumps(obj, option=self._opts)
+        except self._errors:
+            return _STD_SERIALIZER.dumps_bytes(obj)
+
+    def loads(self, data: str | bytes) -> Any:
+        try:
+            return self._loads(data)
+        except self._errors:
+            return _STD_SERIALIZER.loads(data)
+
+
+class MsgspecSerializer(JSONSerializer):
+    """使用 msgspec 的序列化器
+
+    msgspec 不支持的数据（例如超出 64 位的整数），回退到标准库处理
+    """
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._errors = (msgspec.MsgspecError, TypeError, OverflowError)
+
+    def dumps(self, obj: Any) -> str:
+        return self.dumps_bytes(obj).decode()
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        try:
+            return cast(bytes, self._encoder.encode(obj))
+        except self._errors:
+            return _STD_SERIALIZER.dumps_bytes(obj)
+
+    def loads(self, data: str | bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._errors:
+            return _STD_SERIALIZER.loads(data)
+
+
+_SERIALIZER_CLASSES: dict[str, type[JSONSerializer]] = {
+    "orjson": OrjsonSerializer,
+    "msgspec": MsgspecSerializer,
+    "json": StdJSONSerializer,
+}
+
+_SERIALIZER: JSONSerializer = _STD_SERIALIZER
+
+
+def get_json_serializer() -> JSONSerializer:
+    """获取当前使用的 JSON 序列化器
+
+    :return: 序列化器
+    """
+    return _SERIALIZER
+
+
+def set_json_serializer(
+    serializer: JSONSerializer | Literal["json", "orjson", "msgspec", "auto"],
+) -> JSONSerializer:
+    """设置 OneBot v11 协议使用的 JSON 序列化器，默认使用标准库
+
+    :param serializer:
+        序列化器对象，或序列化器名称。为 `"auto"` 时按 orjson、msgspec、标准库的顺序，选择第一个已安装的
+    :return: 设置后使用的序列化器
+    """
+    global _SERIALIZER
+
+    if isinstance(serializer, JSONSerializer):
+        _SERIALIZER = serializer
+        return _SERIALIZER
+
+    if serializer == "auto":
+        name = next(
+            (n for n in _SERIALIZER_CLASSES if n == "json" or find_spec(n) is not None), "json"
+        )
+    elif serializer in _SERIALIZER_CLASSES:
+        name = serializer
+    else:
+        raise ValueError(f"未知的 JSON 序列化器：{serializer}")
+
+    if name == "json":
+        _SERIALIZER = _STD_SERIALIZER
+    else:
+        _SERIALIZER = _SERIALIZER_CLASSES[name]()
+    return _SERIALIZER
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import http
-import json
 import time
 from asyncio import Future
 
@@ -17,6 +16,7 @@ from melobot.utils import get_id
 
 from ..const import ACTION_TYPE_KEY_NAME
 from .base import BaseIOSource, InstCounter
+from .limit import RateLimiter
 from .packet import (
     DownstreamCallInPacket,
     EchoPacket,
@@ -27,6 +27,7 @@ from .packet import (
     ShareToDownstreamInPacket,
     UpstreamRetInPacket,
 )
+from .serialize import get_json_serializer
 from .ws_impl import WSClientImpl, WSServerImpl
 
 if TYPE_CHECKING:
@@ -36,8 +37,6 @@ if TYPE_CHECKING:
 class GenericIOLayer:
     def __init__(self, rproxy: "RProxyWSClient | RProxyWSServer | None") -> None:
         self._in_buf: asyncio.Queue[InPacket] = asyncio.Queue()
-        self._out_buf: asyncio.Queue[OutPacket] = asyncio.Queue()
-        self._pre_send_time = time.time_ns()
         self._echo_table: dict[str, tuple[str, Future[EchoPacket]]] = {}
         self._echo_mapping: dict[str, tuple[str, str]] = {}
 
@@ -47,24 +46,34 @@ class GenericIOLayer:
 
         # 在继承具体的实现类后拥有这些属性
         self.name: str
-        self.cd_time: float
+        self.rate_limiter: RateLimiter
         self._hook_bus: HookBus
         self._start: Callable[[], Coroutine[Any, Any, None]]
         self._stop: Callable[[], Coroutine[Any, Any, None]]
         self._opened: asyncio.Event
 
     async def _on_received(self, raw: str | bytes) -> None:
-        if raw == "":
+        if raw == "" or raw == b"":
             return
 
-        raw_dic = json.loads(raw)
+        raw_dic = get_json_serializer().loads(raw)
         if "post_type" in raw_dic:
             if self._rproxy is None:
                 self._in_buf.put_nowait(InPacket(time=raw_dic["time"], data=raw_dic))
+            elif self._rproxy.forward_mode == "mirror":
+                # 镜像模式下直接转发原始数据帧，不受事件处理结果影响
+                self._rproxy.to_downstream(raw)
+                self._in_buf.put_nowait(InPacket(time=raw_dic["time"], data=raw_dic))
             else:
-                share_pak = ShareToDownstreamInPacket(time=raw_dic["time"], data=raw_dic)
+                share_pak = ShareToDownstreamInPacket(
+                    time=raw_dic["time"],
+                    data=raw_dic,
+                    frame=raw if self._rproxy.forward_mode == "passthrough" else None,
+                )
                 self._in_buf.put_nowait(share_pak)
-                asyncio.create_task(self._to_downstream(share_pak.to_downstream))
+                asyncio.create_task(
+                    self._to_downstream(share_pak.to_downstream, share_pak.frame)
+                )
             return
 
         echo_id = raw_dic.get("echo")
@@ -80,6 +89,7 @@ class GenericIOLayer:
 
             # 查表获得下游发起调用时使用的回声字段
             calling_type, down_seen_echo = self._echo_mapping.pop(echo_id)
+            self.rate_limiter.feedback(raw_dic["retcode"])
             raw_dic[ACTION_TYPE_KEY_NAME] = calling_type
             raw_dic["echo"] = down_seen_echo
             event_data["ret"] = raw_dic
@@ -91,6 +101,7 @@ class GenericIOLayer:
         else:
             # 在这里处理 melobot 内部发起的调用的返回结果
             action_type, fut = self._echo_table.pop(echo_id)
+            self.rate_limiter.feedback(raw_dic["retcode"])
             fut.set_result(
                 EchoPacket(
                     time=int(time.time_ns() / 1e9),
@@ -102,14 +113,9 @@ class GenericIOLayer:
             )
 
     async def _on_get_output(self) -> str | bytes | None:
-        out_packet = await self._out_buf.get()
-        wait_time = self.cd_time - ((time.time_ns() - self._pre_send_time) / 1e9)
-        await asyncio.sleep(wait_time)
+        out_packet = await self.rate_limiter.get()
         return out_packet.data
 
-    async def _on_sent(self, out: str | bytes) -> None:
-        self._pre_send_time = time.time_ns()
-
     async def _on_relinked(self) -> None:
         await self._hook_bus.emit(SourceLifeSpan.RESTARTED, False)
 
@@ -117,12 +123,12 @@ class GenericIOLayer:
         return await self._in_buf.get()
 
     async def output(self, packet: OutPacket) -> EchoPacket:
-        if self._out_buf.qsize() > 100:
+        if self.rate_limiter.full():
             logger.warning(
                 f"{self.name} 输出缓冲区溢出，开始丢弃操作请求。请保证连接畅通或减少操作请求频率"
             )
             raise RuntimeError("输出缓冲区溢出，操作请求被丢弃")
-        self._out_buf.put_nowait(packet)
+        self.rate_limiter.put_nowait(packet)
         if packet.echo_id is None:
             return EchoPacket(noecho=True)
 
@@ -136,20 +142,26 @@ class GenericIOLayer:
         return await fut
 
     async def _to_downstream(
-        self, fut: Future[EventToDownstream] | Future[EchoToDownstream]
+        self,
+        fut: Future[EventToDownstream] | Future[EchoToDownstream],
+        frame: str | bytes | None = None,
     ) -> None:
         try:
             ret = await fut
-            if not ret.is_forbidden() and self._rproxy is not None:
+            if ret.is_forbidden() or self._rproxy is None:
+                return
+            if frame is not None and not ret.is_updated():
+                self._rproxy.to_downstream(frame)
+            else:
                 self._rproxy.to_downstream(ret.get_json())
         except Exception:
             logger.generic_exc(f"{self.name} 传递数据给下游时发生异常", obj={"fut": fut})
 
     async def _to_upstream(self, raw: str | bytes) -> None:
         try:
-            if raw == "":
+            if raw == "" or raw == b"":
                 return
-            raw_dic = json.loads(raw)
+            raw_dic = get_json_serializer().loads(raw)
             raw_dic["post_type"] = "downstream_call"
             raw_dic["time"] = int(time.time_ns() / 1e9)
             raw_dic["self_id"] = -1
@@ -165,8 +177,8 @@ class GenericIOLayer:
             # 因为下游的回声标识可能和 melobot 内部的冲突，虽然概率很小
             down_seen_echo = out.echo
             up_seen_echo = get_id()
-            out_data = json.dumps(
-                {**out.get_dict(deepcopy=False), "echo": up_seen_echo}, ensure_ascii=False
+            out_data = get_json_serializer().dumps(
+                {**out.get_dict(deepcopy=False), "echo": up_seen_echo}
             )
             out_pak = OutPacket(
                 data=out_data,
@@ -180,7 +192,7 @@ class GenericIOLayer:
                 )
                 raise RuntimeError(f"{self.name} 反代 echo 标识映射表溢出，操作请求被丢弃")
             self._echo_mapping[up_seen_echo] = (out_pak.action_type, down_seen_echo)
-            self._out_buf.put_nowait(out_pak)
+            self.rate_limiter.put_nowait(out_pak)
         except Exception:
             logger.generic_exc(f"{self.name} 传递数据给上游时发生异常", obj={"raw": raw})
 
@@ -209,6 +221,7 @@ class WSClient(InstCounter, GenericIOLayer, WSClientImpl, BaseIOSource):
         rproxy: "RProxyWSClient | RProxyWSServer | None" = None,
         *,
         name: str | None = None,
+        rate_limiter: RateLimiter | None = None,
     ) -> None:
         InstCounter.__init__(self)
         GenericIOLayer.__init__(self, rproxy=rproxy)
@@ -222,7 +235,7 @@ class WSClient(InstCounter, GenericIOLayer, WSClientImpl, BaseIOSource):
             max_retry=max_retry,
             retry_delay=retry_delay,
         )
-        BaseIOSource.__init__(self, cd_time=cd_time)
+        BaseIOSource.__init__(self, cd_time=cd_time, rate_limiter=rate_limiter)
         self._hook_bus.set_tag(self.name)
 
 
@@ -236,6 +249,7 @@ class WSServer(InstCounter, GenericIOLayer, WSServerImpl, BaseIOSource):
         rproxy: "RProxyWSClient | RProxyWSServer | None" = None,
         *,
         name: str | None = None,
+        rate_limiter: RateLimiter | None = None,
     ) -> None:
         InstCounter.__init__(self)
         GenericIOLayer.__init__(self, rproxy=rproxy)
@@ -245,7 +259,7 @@ class WSServer(InstCounter, GenericIOLayer, WSServerImpl, BaseIOSource):
             host=host,
             port=port,
         )
-        BaseIOSource.__init__(self, cd_time=cd_time)
+        BaseIOSource.__init__(self, cd_time=cd_time, rate_limiter=rate_limiter)
         self.access_token = access_token
 
         self._hook_bus.set_tag(self.name)
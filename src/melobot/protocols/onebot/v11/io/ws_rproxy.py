@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 import http
 
-from typing_extensions import Any, Callable, Coroutine
+from typing_extensions import Any, Callable, Coroutine, Literal
 from websockets.asyncio.server import ServerConnection
 from websockets.http11 import Request, Response
 
@@ -15,9 +15,12 @@ from .ws_impl import WSClientImpl, WSServerImpl
 
 
 class GenericRProxyLayer:
-    def __init__(self) -> None:
+    def __init__(self, forward_mode: Literal["rebuild", "passthrough", "mirror"]) -> None:
+        if forward_mode not in ("rebuild", "passthrough", "mirror"):
+            raise ValueError(f"未知的反代转发模式：{forward_mode}")
         self.io_src: GenericIOLayer | None = None
-        self.to_downstream_buf: asyncio.Queue[str] = asyncio.Queue()
+        self.to_downstream_buf: asyncio.Queue[str | bytes] = asyncio.Queue()
+        self.forward_mode = forward_mode
 
         # 在继承具体的实现类后拥有这些属性
         self.name: str
@@ -47,7 +50,7 @@ class GenericRProxyLayer:
     async def close(self) -> None:
         await self._stop()
 
-    def to_downstream(self, raw: str) -> None:
+    def to_downstream(self, raw: str | bytes) -> None:
         if self.to_downstream_buf.qsize() > 100:
             logger.warning(
                 f"{self.name} 输出缓冲区溢出，开始丢弃发送到下游的数据。请保证连接畅通或减少数据发送频率"
@@ -63,11 +66,12 @@ class RProxyWSClient(InstCounter, GenericRProxyLayer, WSClientImpl):
         max_retry: int = -1,
         retry_delay: float = 4.0,
         access_token: str | None = None,
+        forward_mode: Literal["rebuild", "passthrough", "mirror"] = "passthrough",
         *,
         name: str | None = None,
     ) -> None:
         InstCounter.__init__(self)
-        GenericRProxyLayer.__init__(self)
+        GenericRProxyLayer.__init__(self, forward_mode)
         WSClientImpl.__init__(
             self,
             name=f"OB11 反代/WS 客户端 #{self.INSTANCE_COUNT}" if name is None else name,
@@ -82,10 +86,16 @@ class RProxyWSClient(InstCounter, GenericRProxyLayer, WSClientImpl):
 
 class RProxyWSServer(InstCounter, GenericRProxyLayer, WSServerImpl):
     def __init__(
-        self, host: str, port: int, access_token: str | None = None, *, name: str | None = None
+        self,
+        host: str,
+        port: int,
+        access_token: str | None = None,
+        forward_mode: Literal["rebuild", "passthrough", "mirror"] = "passthrough",
+        *,
+        name: str | None = None,
     ) -> None:
         InstCounter.__init__(self)
-        GenericRProxyLayer.__init__(self)
+        GenericRProxyLayer.__init__(self, forward_mode)
         WSServerImpl.__init__(
             self,
             name=f"OB11 反代/WS 服务端 #{self.INSTANCE_COUNT}" if name is None else name,
@@ -8,7 +8,7 @@ from contextlib import _AsyncGeneratorContextManager, asynccontextmanager
 from typing_extensions import Any, AsyncGenerator, Hashable, cast
 
 from ..adapter.model import Event
-from ..ctx import FlowCtx, SessionCtx
+from ..ctx import BotCtx, FlowCtx, SessionCtx
 from ..di import SENTINEL, BindDepends
 from ..exceptions import SessionError, SessionRuleLacked, SessionStateFailed
 from ..handle.base import EventCompletion, stop
@@ -63,6 +63,8 @@ class WorkingSessionState(SessionState):
 
         cond = self.session._refresh_cond
         self.session.__to_state__(SuspendSessionState)
+        if (bot := BotCtx().try_get()) is not None:
+            bot._dispatcher.settle(self.session.event)
         async with cond:
             cond.notify()
 
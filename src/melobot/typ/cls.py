@@ -11,10 +11,12 @@ class BetterABCMeta(ABCMeta):
 
     class DummyAttribute: ...
 
+    __abstract_attrs__: dict[type, tuple[str, ...]] = {}
+
     def __call__(cls: type[T], *args: Any, **kwargs: Any) -> T:
         instance = ABCMeta.__call__(cls, *args, **kwargs)
         lack_attrs = set()
-        for name in dir(instance):
+        for name in BetterABCMeta._get_abstract_attrs(cls):
             try:
                 attr = getattr(instance, name)
             except Exception:
@@ -33,6 +35,19 @@ class BetterABCMeta(ABCMeta):
             )
         return cast(T, instance)
 
+    @staticmethod
+    def _get_abstract_attrs(cls: type) -> tuple[str, ...]:
+        # 只有在类层级仍为抽象属性的名称，才需要在实例化后检查，结果按类缓存
+        # 这样实例化时不会遍历实例的所有属性，也不会触发实例上的 property 等描述符
+        attrs = BetterABCMeta.__abstract_attrs__.get(cls)
+        if attrs is None:
+            attrs = BetterABCMeta.__abstract_attrs__[cls] = tuple(
+                name
+                for name in dir(cls)
+                if getattr(getattr(cls, name, None), "__is_abstract_attribute__", False)
+            )
+        return attrs
+
 
 class BetterABC(metaclass=BetterABCMeta):
     """更好的抽象类，兼容 `ABC` 的所有功能，但是额外支持 :func:`abstractattr`"""
@@ -0,0 +1,93 @@
+"""cq 字符串解析耗时基准
+
+运行方式：python -m tests.bench.cq（需在项目根目录，且 src 目录位于导入路径中）
+"""
+
+import re
+from itertools import chain, zip_longest
+from time import perf_counter
+
+from typing_extensions import Any, Callable, Match
+
+from melobot.protocols.onebot.v11.adapter.segment import _cq_to_dicts, cq_anti_escape
+
+SIZES = (10, 100, 1000)
+REPEAT = 200
+
+
+def _legacy_cq_to_dicts(s: str) -> list[dict[str, Any]]:
+    # 旧的多趟实现，仅用于对比（不含 node 嵌套内容的解析）
+    cq_texts: list[str] = []
+
+    def replace_func(m: Match) -> str:
+        s, e = m.regs[0]
+        cq_texts.append(m.string[s:e])
+        return "\u0000"
+
+    cq_regex = re.compile(r"\[CQ:.*?\]")
+
+    no_cq_str = cq_regex.sub(replace_func, s)
+    pure_texts = map(
+        lambda x: f"[CQ:text,text={x}]" if x != "" else x,
+        no_cq_str.split("\u0000"),
+    )
+    cq_entity_str: str = "".join(
+        chain.from_iterable(zip_longest(pure_texts, cq_texts, fillvalue=""))
+    )
+
+    cq_entity: list[str] = cq_entity_str.split("]")[:-1]
+    dicts: list[dict[str, Any]] = []
+
+    for e in cq_entity:
+        cq_parts = e.split(",")
+        cq_type = cq_parts[0][4:]
+        cq_data: dict[str, Any] = {}
+
+        for param_pair in cq_parts[1:]:
+            name, val = param_pair.split("=", maxsplit=1)
+            if len(cq_entity) == 1 and cq_type == "text":
+                cq_data[name] = val
+            else:
+                cq_data[name] = (
+                    val.replace("&#44;", ",")
+                    .replace("&#93;", "]")
+                    .replace("&#91;", "[")
+                    .replace("&amp;", "&")
+                )
+
+        dicts.append({"type": cq_type, "data": cq_data})
+
+    return dicts
+
+
+def _message(size: int) -> str:
+    # 文本、at、表情、图片交替出现的长消息
+    unit = "你好&#91;世界&#93;[CQ:at,qq=1574260633]abc[CQ:face,id=123][CQ:image,file=a&#44;b.jpg]"
+    return unit * (size // 4)
+
+
+CASES: dict[str, Callable[[str], Any]] = {
+    "legacy": _legacy_cq_to_dicts,
+    "current": _cq_to_dicts,
+    "anti-esc": cq_anti_escape,
+}
+
+
+def main() -> None:
+    for size in SIZES:
+        assert _legacy_cq_to_dicts(_message(size)) == _cq_to_dicts(_message(size))
+
+    print(f"{'case':<10}" + "".join(f"{f'{size} segs':>12}" for size in SIZES))
+    for name, case in CASES.items():
+        costs = []
+        for size in SIZES:
+            msg = _message(size)
+            start = perf_counter()
+            for _ in range(REPEAT):
+                case(msg)
+            costs.append((perf_counter() - start) / REPEAT)
+        print(f"{name:<10}" + "".join(f"{cost * 1e6:>10.1f}us" for cost in costs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""处理流图结构的构建与验证耗时基准
+
+运行方式：python -m tests.bench.graph（需在项目根目录，且 src 目录位于导入路径中）
+"""
+
+from time import perf_counter
+
+from typing_extensions import Callable
+
+from melobot.handle.graph import DAGMapping
+
+SIZES = (100, 1000, 10000)
+
+
+def _chain(size: int) -> None:
+    DAGMapping("chain", list(range(size)))
+
+
+def _tree(size: int) -> None:
+    # 模拟代码生成的命令树：每个结点分出 4 个子结点
+    g = DAGMapping[int]("tree")
+    for n in range(1, size):
+        g.add((n - 1) // 4, n)
+    g.verify()
+
+
+def _layers(size: int) -> None:
+    # 每层 10 个结点，相邻层全连接
+    DAGMapping("layers", *[[range(i, i + 10), range(i + 10, i + 20)] for i in range(0, size, 10)])
+
+
+def _link(size: int) -> None:
+    half = size // 2
+    a = DAGMapping("a", list(range(half)))
+    b = DAGMapping("b", list(range(half, size)))
+    a.link(b, "a ~ b")
+
+
+CASES: dict[str, Callable[[int], None]] = {
+    "chain": _chain,
+    "tree": _tree,
+    "layers": _layers,
+    "link": _link,
+}
+
+
+def main() -> None:
+    print(f"{'case':<8}" + "".join(f"{size:>12}" for size in SIZES))
+    for name, case in CASES.items():
+        costs = []
+        for size in SIZES:
+            start = perf_counter()
+            case(size)
+            costs.append(perf_counter() - start)
+        print(f"{name:<8}" + "".join(f"{cost * 1000:>10.2f}ms" for cost in costs))
+
+
+if __name__ == "__main__":
+    main()
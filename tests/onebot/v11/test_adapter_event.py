@@ -147,6 +147,87 @@ async def test_msg(msg_head, private_sender, group_sender) -> None:
     assert isinstance(e7, event.PrivateMessageEvent)
 
 
+async def test_msg_trusted(msg_head, group_sender) -> None:
+    data = msg_head | {
+        "message_type": "group",
+        "sub_type": "normal",
+        "sender": group_sender,
+        "message_id": -1234567890,
+        "font": 0,
+        "message": [
+            {"type": "text", "data": {"text": "123"}},
+            {"type": "at", "data": {"qq": "1574260633"}},
+            {"type": "text", "data": {"text": "456\n789"}},
+        ],
+        "user_id": 1574260633,
+        "anonymous": None,
+        "group_id": 535705163,
+        "raw_message": "123[CQ:at,qq=1574260633]456\n789",
+    }
+    e1 = event.Event.resolve_trusted(data)
+    assert isinstance(e1, event.GroupMessageEvent)
+    assert "text" not in e1.__dict__ and "sender" not in e1.__dict__
+    assert e1.text == "123456\n789"
+    assert e1.textlines == ["123456", "789"]
+    assert len(e1.message) == 3 and e1.message[1] is e1.message[1]
+    assert cast(TextContent, e1.contents[0]).text == "123"
+    assert e1.sender.user_id == 1574260633 and e1.sender.is_group_member_only()
+    assert e1.group_id == 535705163
+
+    e2 = event.Event.resolve(data)
+    assert e2.text == e1.text and e2.sender.role == e1.sender.role
+    assert "text" in e2.__dict__ and "sender" in e2.__dict__
+
+    bad = data | {"sender": {"user_id": "not-an-id"}}
+    with pt.raises(Exception):
+        event.Event.resolve(bad)
+    e3 = event.Event.resolve_trusted(bad)
+    with pt.raises(Exception):
+        e3.sender
+
+
+async def test_msg_lazy_segments(msg_head, private_sender) -> None:
+    head = msg_head | {
+        "message_type": "private",
+        "sub_type": "friend",
+        "sender": private_sender,
+        "message_id": -1234567890,
+        "font": 0,
+        "user_id": 1574260633,
+    }
+    e1 = event.Event.resolve(
+        head
+        | {
+            "message": [
+                {"type": "text", "data": {"text": "abc"}},
+                {"type": "face", "data": {"id": "not-an-id"}},
+            ],
+            "raw_message": "abc[CQ:face,id=not-an-id]",
+        }
+    )
+    # 文本提取不解析其他消息段
+    assert e1.text == "abc"
+    assert e1.message[0].type == "text" and e1.message[-2] is e1.message[:1][0]
+    with pt.raises(Exception):
+        e1.get_segments("face")
+
+    with pt.raises(Exception):
+        event.Event.resolve(
+            head
+            | {
+                "message": [{"type": "text", "data": {"text": 123}}],
+                "raw_message": "123",
+            }
+        )
+
+    e2 = event.Event.resolve(
+        head | {"message": "a&#91;[CQ:at,qq=123]b", "raw_message": "a&#91;[CQ:at,qq=123]b"}
+    )
+    assert e2.text == "a[b"
+    assert [seg.type for seg in e2.message] == ["text", "at", "text"]
+    assert e2.get_datas("at", "qq") == [123]
+
+
 @fixture
 def meta_head(base_head):
     return base_head | {"post_type": "meta_event"}
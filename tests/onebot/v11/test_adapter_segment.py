@@ -98,3 +98,18 @@ async def test_serialize_and_deserialize():
     assert s6.to_cq() == "[CQ:image,file=12345678.jpg]"
 
     assert s6.to_json() == '{"type": "image", "data": {"file": "12345678.jpg"}}'
+
+
+async def test_resolve_cq():
+    segs = seg.Segment.__resolve_cq__("hello, world]&#91;[CQ:at,qq=123]a&#44;b[CQ:shake]")
+    assert [s.to_dict() for s in segs] == [
+        {"type": "text", "data": {"text": "hello, world]["}},
+        {"type": "at", "data": {"qq": 123}},
+        {"type": "text", "data": {"text": "a,b"}},
+        {"type": "shake", "data": {}},
+    ]
+
+    assert seg.Segment.__resolve_cq__("1&#91;2")[0].data["text"] == "1&#91;2"
+    assert seg.Segment.__resolve_cq__("a\n[CQ:at,qq=1\n]")[0].data["text"] == "a\n[CQ:at,qq=1\n]"
+    assert seg.cq_anti_escape("&amp;#44;&#91;&#93;") == "&#44;[]"
+    assert seg.cq_filter_text("a[CQ:at,qq=1]b[CQ:face,id=2]") == "ab"
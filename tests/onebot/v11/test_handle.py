@@ -6,6 +6,7 @@ from melobot.handle import on_start_match
 from melobot.log import logger
 from melobot.plugin import PluginPlanner
 from melobot.protocols.onebot.v11.adapter.base import Adapter
+from melobot.protocols.onebot.v11.adapter.event import GroupMessageEvent
 from melobot.protocols.onebot.v11.io.base import BaseIOSource
 from melobot.protocols.onebot.v11.io.packet import EchoPacket, InPacket, OutPacket
 from melobot.protocols.onebot.v11.utils import GroupMsgChecker, LevelRole
@@ -93,3 +94,97 @@ async def test_handle():
     mbot.load_plugin(PluginPlanner("1.0.0", flows=[_flow]))
     await mbot.run_async()
     await _SUCCESS_SIGNAL.wait()
+
+
+_BATCH_NUM = 20
+_BATCH_RECORDS: list[tuple[int, int]] = []
+_BATCH_DONE = asyncio.Event()
+
+
+@on_start_match(".batch", priority=1)
+async def _batch_high(event: GroupMessageEvent) -> None:
+    _BATCH_RECORDS.append((1, event.message_id))
+
+
+@on_start_match(".batch")
+async def _batch_low(bot: Bot, event: GroupMessageEvent) -> None:
+    _BATCH_RECORDS.append((0, event.message_id))
+    if sum(1 for lvl, _ in _BATCH_RECORDS if lvl == 0) == _BATCH_NUM:
+        await bot.close()
+        _BATCH_DONE.set()
+
+
+class BatchIO(TempIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.queue = Queue()
+        for i in range(_BATCH_NUM):
+            self.queue.put_nowait(
+                InPacket(
+                    data=_GRUOP_EVENT_DICT
+                    | {"message_id": i, "message": ".batch", "raw_message": ".batch"}
+                )
+            )
+
+
+async def test_batch_handle():
+    mbot = Bot("test_batch_handle", batch_dispatch=True)
+    mbot.add_io(BatchIO())
+    mbot.add_adapter(Adapter())
+    mbot.load_plugin(PluginPlanner("1.0.0", flows=[_batch_high, _batch_low]))
+    await mbot.run_async()
+    await _BATCH_DONE.wait()
+    assert len(_BATCH_RECORDS) == 2 * _BATCH_NUM
+    for i in range(_BATCH_NUM):
+        assert _BATCH_RECORDS.index((1, i)) < _BATCH_RECORDS.index((0, i))
+
+
+_LANE_NUM = 6
+_LANE_GROUPS = (1, 2, 3)
+_LANE_RECORDS: dict[int, list[int]] = {gid: [] for gid in _LANE_GROUPS}
+_LANE_STATE = {"running": 0, "max": 0}
+_LANE_DONE = asyncio.Event()
+
+
+@on_start_match(".lane")
+async def _lane_flow(bot: Bot, event: GroupMessageEvent) -> None:
+    _LANE_STATE["running"] += 1
+    _LANE_STATE["max"] = max(_LANE_STATE["max"], _LANE_STATE["running"])
+    # 越早到达的事件处理得越久，没有分片时顺序必然被打乱
+    await asyncio.sleep(0.002 * (_LANE_NUM - event.message_id))
+    _LANE_RECORDS[event.group_id].append(event.message_id)
+    _LANE_STATE["running"] -= 1
+    if sum(len(r) for r in _LANE_RECORDS.values()) == _LANE_NUM * len(_LANE_GROUPS):
+        await bot.close()
+        _LANE_DONE.set()
+
+
+class LaneIO(TempIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.queue = Queue()
+        for i in range(_LANE_NUM):
+            for gid in _LANE_GROUPS:
+                self.queue.put_nowait(
+                    InPacket(
+                        data=_GRUOP_EVENT_DICT
+                        | {
+                            "message_id": i,
+                            "group_id": gid,
+                            "message": ".lane",
+                            "raw_message": ".lane",
+                        }
+                    )
+                )
+
+
+async def test_scope_lanes():
+    mbot = Bot("test_scope_lanes", scope_lanes=2)
+    mbot.add_io(LaneIO())
+    mbot.add_adapter(Adapter())
+    mbot.load_plugin(PluginPlanner("1.0.0", flows=[_lane_flow]))
+    await mbot.run_async()
+    await _LANE_DONE.wait()
+    assert _LANE_STATE["max"] == 2
+    for records in _LANE_RECORDS.values():
+        assert records == list(range(_LANE_NUM))
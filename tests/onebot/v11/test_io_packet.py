@@ -1,6 +1,6 @@
 import time
 
-from melobot.protocols.onebot.v11.io import packet
+from melobot.protocols.onebot.v11.io import packet, serialize
 from tests.base import *
 
 
@@ -13,3 +13,44 @@ async def test_packet():
         echo_id="123456",
     )
     p = packet.EchoPacket(time=time.time(), data={"key": "value"})
+
+
+async def test_to_stream_copy():
+    params = {"message": [{"type": "text", "data": {"text": "x"}}], "user_id": 1}
+    up = packet.ActionToUpstream("send_msg", params, "1")
+    up.set_param("user_id", 2)
+    assert params["user_id"] == 1 and up.params["user_id"] == 2
+    assert up.params["message"] is params["message"]
+
+    raw = {"status": "ok", "data": {"message_id": 1}}
+    down = packet.EchoToDownstream(raw)
+    down.set_param("retcode", 0)
+    down.set_data_param("message_id", 2)
+    assert raw == {"status": "ok", "data": {"message_id": 1}}
+    assert down.get_dict() == {"status": "ok", "retcode": 0, "data": {"message_id": 2}}
+
+
+async def test_json_serializer():
+    origin = serialize.get_json_serializer()
+    obj = {"text": "你好", "id": 2**70, 1: [True, None]}
+    try:
+        std = serialize.set_json_serializer("json")
+        assert isinstance(std, serialize.StdJSONSerializer)
+        assert std.dumps(obj) == '{"text": "你好", "id": 1180591620717411303424, "1": [true, null]}'
+
+        pt.importorskip("orjson")
+        fast = serialize.set_json_serializer("auto")
+        assert serialize.get_json_serializer() is fast and fast.name != "json"
+        assert fast.loads(fast.dumps_bytes(obj)) == std.loads(std.dumps(obj))
+        assert fast.loads(std.dumps(obj).encode()) == std.loads(std.dumps(obj))
+    finally:
+        serialize.set_json_serializer(origin)
+
+
+async def test_to_downstream_updated():
+    down = packet.EventToDownstream({"post_type": "message"})
+    assert not down.is_updated()
+    down.override(down.get_dict(deepcopy=False))
+    assert not down.is_updated()
+    down.set_param("post_type", "notice")
+    assert down.is_updated()
@@ -0,0 +1,109 @@
+from typing_extensions import Annotated
+
+from melobot.adapter.model import Event, TextEvent
+from melobot.di import Depends, DependsLifetime, Exclude, inject_deps
+from melobot.handle.base import Flow, FlowNode
+from tests.base import *
+
+
+class _TextEvent(TextEvent):
+    def __init__(self) -> None:
+        super().__init__("test")
+        self.text = ""
+        self.textlines = [""]
+
+
+class _OtherEvent(Event):
+    def __init__(self) -> None:
+        super().__init__("test")
+
+
+async def test_compiled_deps():
+    records = []
+
+    async def any_event(event: Event):
+        records.append(("any", event))
+
+    async def text_event(event: _TextEvent):
+        records.append(("text", event))
+
+    async def union_event(event: _TextEvent | _OtherEvent):
+        records.append(("union", event))
+
+    async def exclude_event(event: Annotated[Event, Exclude(types=[_TextEvent])]):
+        records.append(("exclude", event))
+
+    flow = Flow(
+        "deps", *([FlowNode(f)] for f in (any_event, text_event, union_event, exclude_event))
+    )
+    e1, e2 = Event("test"), _TextEvent()
+    await flow._start(e1)
+    await flow._start(e2)
+    assert records == [("any", e1), ("exclude", e1), ("any", e2), ("text", e2), ("union", e2)]
+
+
+async def test_manual_args():
+    def add(a: int, b: int = 1, *, c: int = 2) -> int:
+        return a + b + c
+
+    f = inject_deps(add, manual_arg=True)
+    assert await f(1) == 4
+    assert await f(1, 2, c=3) == 6
+    assert await inject_deps(lambda: 5)() == 5
+
+
+async def test_deps_lifetime():
+    counts = {"event": 0, "flow": 0, "ttl": 0, "fail": 0}
+
+    async def get_event_dep():
+        counts["event"] += 1
+        await aio.sleep(0.01)
+        return counts["event"]
+
+    def get_flow_dep():
+        counts["flow"] += 1
+        return counts["flow"]
+
+    def get_ttl_dep():
+        counts["ttl"] += 1
+        return counts["ttl"]
+
+    def get_fail_dep():
+        counts["fail"] += 1
+        raise ValueError("fail")
+
+    event_dep = Depends(get_event_dep, lifetime=DependsLifetime.EVENT)
+    flow_dep = Depends(get_flow_dep, lifetime=DependsLifetime.FLOW)
+    ttl_dep = Depends(get_ttl_dep, ttl=0.05)
+    fail_dep = Depends(get_fail_dep, lifetime=DependsLifetime.EVENT)
+    vals = []
+
+    def make_node() -> FlowNode:
+        async def n(a=event_dep, b=flow_dep):
+            vals.append((a, b))
+
+        return FlowNode(n)
+
+    flows = [Flow(f"f{i}", [make_node(), make_node()]) for i in range(3)]
+    e1, e2 = Event("test"), Event("test")
+    await aio.gather(*(f._start(e1) for f in flows))
+    assert counts["event"] == 1 and counts["flow"] == 3
+    assert {a for a, _ in vals} == {1}
+    assert all(vals[i][1] == vals[i + 1][1] for i in range(0, len(vals), 2))
+    await flows[0]._start(e2)
+    assert counts["event"] == 2
+
+    scope: dict = {}
+    assert await ttl_dep.fulfill(scope) == await ttl_dep.fulfill(scope) == 1
+    await aio.sleep(0.06)
+    assert await ttl_dep.fulfill(scope) == 2
+
+    def make_fail_node() -> FlowNode:
+        async def n(v=fail_dep):
+            pass
+
+        return FlowNode(n)
+
+    await Flow("fail1", [make_fail_node()])._start(e1)
+    await Flow("fail2", [make_fail_node()])._start(e1)
+    assert counts["fail"] == 2
@@ -0,0 +1,75 @@
+from collections import deque
+
+from melobot.adapter.model import Event, TextEvent
+from melobot.bot import ChannelLimit, ShedPolicy
+from melobot.bot.dispatch import FlowRouter
+from melobot.handle import on_event, on_start_match, on_text
+from melobot.handle.base import Flow
+from tests.base import *
+
+
+class _Event(Event):
+    def __init__(self, protocol: str = "test") -> None:
+        super().__init__(protocol)
+
+
+class _TextEvent(TextEvent):
+    def __init__(self, text: str, protocol: str = "test") -> None:
+        super().__init__(protocol)
+        self.text = text
+        self.textlines = text.split("\n")
+
+
+async def _func() -> None:
+    pass
+
+
+async def test_router():
+    router = FlowRouter()
+    plain = Flow("plain")
+    any_flow = on_event()(_func)
+    text_flow = on_text()(_func)
+    echo_flow = on_start_match([".echo", "!echo"])(_func)
+    help_flow = on_start_match(".help")(_func)
+    other_proto = Flow("other")
+    other_proto.set_route(protocol="other")
+    for f in (plain, any_flow, text_flow, echo_flow, help_flow, other_proto):
+        router.add(f)
+
+    assert set(router.route(_Event())) == {plain, any_flow}
+    assert set(router.route(_TextEvent("hello"))) == {plain, any_flow, text_flow}
+    assert set(router.route(_TextEvent(".echo 1"))) == {plain, any_flow, text_flow, echo_flow}
+    assert set(router.route(_TextEvent("!echo 1"))) == {plain, any_flow, text_flow, echo_flow}
+    assert set(router.route(_TextEvent(".help"))) == {plain, any_flow, text_flow, help_flow}
+    assert set(router.route(_TextEvent("", "other"))) == {plain, any_flow, text_flow, other_proto}
+
+    router.remove(echo_flow)
+    assert set(router.route(_TextEvent(".echo 1"))) == {plain, any_flow, text_flow}
+    assert len(router) == 5
+
+
+class _HeartbeatEvent(_Event): ...
+
+
+async def test_shed_select():
+    e1, e2, hb, e3 = _Event(), _Event(), _HeartbeatEvent(), _Event()
+    queued = deque([e1, hb, e2])
+
+    with pt.raises(ValueError):
+        ChannelLimit(0)
+    with pt.raises(ValueError):
+        ChannelLimit(3, ShedPolicy.DROP_BY_TYPE)
+
+    assert ChannelLimit(3, ShedPolicy.DROP_NEWEST).select_shed(queued, e3) is e3
+    assert ChannelLimit(3, ShedPolicy.DROP_OLDEST).select_shed(queued, e3) is e1
+    assert ChannelLimit(3, ShedPolicy.DROP_OLDEST).select_shed(deque(), e3) is e3
+
+    by_type = ChannelLimit(3, ShedPolicy.DROP_BY_TYPE, shed_types=[_HeartbeatEvent])
+    assert by_type.select_shed(queued, e3) is hb
+    assert by_type.select_shed(deque([e1, e2]), e3) is e1
+    assert by_type.select_shed(deque([e1, e2]), hb) is hb
+
+    pris = {e1: 2, e2: 1, hb: 0, e3: 1}
+    by_pri = ChannelLimit(3, ShedPolicy.DROP_BY_PRIORITY, priority_key=lambda e: pris[e])
+    assert by_pri.select_shed(queued, e3) is hb
+    assert by_pri.select_shed(deque([e1, e2]), e3) is e2
@@ -1,4 +1,6 @@
+from melobot.adapter.model import Event
 from melobot.handle.base import Flow, FlowNode
+from melobot.handle.graph import DAGMapping
 from tests.base import *
 
 
@@ -31,3 +33,48 @@ async def test_flow_link():
     assert sum(len(info.nexts) for _, info in nf.graph) == 0
     assert len(nf.graph.starts) == 1
     assert len(nf.graph.ends) == 1
+
+
+async def test_flow_plan():
+    records = []
+
+    def rec_node(name):
+        async def rec():
+            records.append(name)
+
+        return FlowNode(rec, name=name)
+
+    a, b, c = rec_node("a"), rec_node("b"), rec_node("c")
+    f = Flow("plan", [a, b])
+    await f._start(Event("test"))
+    assert records == ["a", "b"]
+    plan = f._plan
+    assert plan is not None and plan.nodes == (a, b)
+
+    await f._start(Event("test"))
+    assert f._plan is plan
+
+    f.after(b)(c)
+    assert f._plan is None
+    records.clear()
+    await f._start(Event("test"))
+    assert records == ["a", "b", "c"]
+    assert f._plan.nexts == ((1,), (2,), ())
+
+
+async def test_graph_verify():
+    g = DAGMapping("g", [1, 2, 3], [1, 2, 3], [(2, 4), 5])
+    assert g[1].nexts == [2]
+    assert g[4].nexts == [5]
+    assert g.topo_order().index(1) < g.topo_order().index(5)
+
+    with pt.raises(ValueError):
+        g.add(5, 1)
+    assert g[5].nexts == [] and g[1].in_deg == 0
+    with pt.raises(ValueError):
+        g.add(3, 3)
+    with pt.raises(ValueError):
+        DAGMapping("cycle", [1, 2, 1])
+
+    g.add(1, 5)
+    assert g.topo_order()[-1] == 5